@@ -1,124 +1,924 @@
 import argparse
-import subprocess
 import re #optional if regex patterns being scanned -ma delete
 import sys
 import os
 import json
-import matplotlib.pyplot as plt
+import csv
+import base64
+import sqlite3
+import mmap
+import time
+import warnings
+import ast
+import hashlib
+from array import array
+from collections import Counter
 
-def load_database(db_folderpath):
-    #fxn to load all db files (.json format) - returns a list of all .json files within target db folder
+# numpy, matplotlib, orjson and the process pool are imported inside the functions that need them, so the plain lookup / compare
+# subcommands (often called thousands of times from regression loops) don't pay for them at startup
+
+#fxn to import pyplot on first use; headless selects the non-interactive Agg backend before pyplot loads
+def load_pyplot(headless=False):
+    import matplotlib
+    if headless:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+#arc fields in the order they appear in a json db arc entry
+ARC_FIELDS = [
+    "related_pin", "direction", "mode", "setup_rise", "setup_fall", "hold_rise", "hold_fall",
+    "comb_setup_rise", "comb_setup_fall", "comb_hold_rise", "comb_hold_fall",
+    "seq_clk_arc", "seq_setup_rise", "seq_setup_fall", "seq_hold_rise", "seq_hold_fall"
+]
+
+class SqliteLibView:
+    """
+    Read-only, dict-like view of one lib inside a sqlite timing db
+    (written by ip-db-gen-script.py --sqlite). It answers the same
+    `pin in db`, `db[pin]`, `db.get(pin)` and `db.keys()` calls the
+    json dbs get, but each one is an indexed query - nothing is loaded
+    up front. The last looked-up pin is cached since callers usually
+    test membership and then fetch the same pin. Membership and
+    arc_signatures only touch the pin/structure columns, so structural
+    compares never fetch values or decode lookup tables.
+    """
+    def __init__(self, conn, lib_id, name, fields=ARC_FIELDS):
+        self.conn = conn
+        self.lib_id = lib_id
+        self.name = name
+        self.fields = fields
+        self._last = (None, None)
+
+    def _fetch_arcs(self, pin):
+        if self._last[0] == pin:
+            return self._last[1]
+        rows = self.conn.execute(
+            f"SELECT {', '.join(self.fields)}, tables FROM arcs WHERE pin = ? AND lib_id = ? ORDER BY arc_index",
+            (pin, self.lib_id)
+        ).fetchall()
+        arcs = None
+        if rows:
+            arcs = []
+            for row in rows:
+                arc = {field: ("N/A" if value is None else value) for field, value in zip(self.fields, row)}
+                if row[-1]:
+                    arc["tables"] = json.loads(row[-1])
+                arcs.append(arc)
+        self._last = (pin, arcs)
+        return arcs
+
+    def __contains__(self, pin):
+        if self._last[0] == pin:
+            return self._last[1] is not None
+        return self.conn.execute("SELECT 1 FROM pins WHERE lib_id = ? AND name = ?", (self.lib_id, pin)).fetchone() is not None
+
+    #fxn to get (related_pin, mode) per arc of a pin, in stored order - the same tuples arc_signatures() builds from arc dicts
+    def arc_signatures(self, pin):
+        rows = self.conn.execute(
+            "SELECT related_pin, mode FROM arcs WHERE pin = ? AND lib_id = ? ORDER BY arc_index", (pin, self.lib_id)
+        ).fetchall()
+        return tuple(("N/A" if rp is None else rp, "N/A" if mode is None else mode) for rp, mode in rows)
+
+    def __getitem__(self, pin):
+        arcs = self._fetch_arcs(pin)
+        if arcs is None:
+            raise KeyError(pin)
+        return arcs
+
+    def get(self, pin, default=None):
+        arcs = self._fetch_arcs(pin)
+        return default if arcs is None else arcs
+
+    def keys(self):
+        return [row[0] for row in self.conn.execute("SELECT name FROM pins WHERE lib_id = ? ORDER BY pin_id", (self.lib_id,))]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM pins WHERE lib_id = ?", (self.lib_id,)).fetchone()[0]
+
+#fxn to open a sqlite timing db - returns one SqliteLibView per lib, ordered by lib name like the json files
+def load_sqlite_database(db_filepath):
+    conn = sqlite3.connect(f"file:{os.path.abspath(db_filepath)}?mode=ro", uri=True)
+    try:
+        libs = conn.execute("SELECT lib_id, name FROM libs ORDER BY name").fetchall()
+    except sqlite3.DatabaseError as e:
+        print(f"Error: {db_filepath} is not a valid sqlite timing db: {e}")
+        return []
+    # ocv sigma columns (<column>_sigma_early/_late) only exist once a lib was extracted with --ocv
+    fields = ARC_FIELDS + [row[1] for row in conn.execute("PRAGMA table_info(arcs)") if row[1].endswith(("_sigma_early", "_sigma_late"))]
+    return [SqliteLibView(conn, lib_id, name, fields) for lib_id, name in libs]
+
+#structure file marking a consolidated multi-corner store (ip-db-gen-script.py --consolidate); attributes are <attribute>.npy next to it
+CONSOLIDATED_STRUCTURE = "structure.json"
+
+class NpyRows:
+    """
+    Row slices of a 2-d (C order) .npy file read straight from disk with
+    one seek + read, so single-pin queries on a consolidated store do not
+    pay for importing numpy. rows() returns a flat array of the rows.
+    """
+    TYPECODES = {"<f8": "d", "|b1": "B"}
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic = f.read(8)
+            if magic[:6] != b"\x93NUMPY":
+                raise ValueError(f"{path} is not a .npy file")
+            length_size = 2 if magic[6] == 1 else 4
+            header_length = int.from_bytes(f.read(length_size), "little")
+            header = ast.literal_eval(f.read(header_length).decode("latin1"))
+        if header["fortran_order"] or header["descr"] not in self.TYPECODES or len(header["shape"]) != 2:
+            raise ValueError(f"{path}: unsupported array layout {header}")
+        self.offset = 8 + length_size + header_length
+        self.typecode = self.TYPECODES[header["descr"]]
+        self.columns = header["shape"][1]
+        self.row_bytes = self.columns * array(self.typecode).itemsize
+
+    def rows(self, start, end):
+        values = array(self.typecode)
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset + start * self.row_bytes)
+            values.frombytes(f.read((end - start) * self.row_bytes))
+        return values
+
+class ConsolidatedStore:
+    """
+    A consolidated multi-corner db written by ip-db-gen-script.py
+    --consolidate. The arc structure is stored once; every numeric
+    attribute is an (arc x corner) float64 array, and the arcs of a pin
+    are consecutive rows, so a pin's values over all corners are a single
+    slice read (NpyRows). Bulk queries memory-map whole arrays instead.
+    Corner metadata (lib header PVT) is in `corners`.
+    """
+    def __init__(self, path):
+        with open(os.path.join(path, CONSOLIDATED_STRUCTURE), 'r') as f:
+            structure = json.load(f)
+        self.path = path
+        self.corners = structure["corners"]
+        self.fields = structure["fields"]
+        self.string_fields = structure["string_fields"]
+        self.attributes = set(structure["attributes"])
+        self.arcs = structure["arcs"]
+        self.pin_rows = {pin: (start, end) for pin, start, end in structure["pins"]}
+        self.overrides = {int(row): {int(corner): diff for corner, diff in per_corner.items()}
+                          for row, per_corner in structure["overrides"].items()}
+        self.n_corners = len(self.corners)
+        self.present = NpyRows(os.path.join(path, "present.npy"))
+        self._present_all = None
+        self._rows = {}
+        self._arrays = {}
+        self.rel_idx = self.string_fields.index("related_pin")
+        self.mode_idx = self.string_fields.index("mode")
+
+    #fxn to get the row reader of an attribute's (arc x corner) array, None for attributes the store does not have
+    def rows(self, attribute):
+        if attribute not in self.attributes:
+            return None
+        if attribute not in self._rows:
+            self._rows[attribute] = NpyRows(os.path.join(self.path, attribute + ".npy"))
+        return self._rows[attribute]
+
+    #fxn to get an attribute's whole (arc x corner) array, memory mapped - for the bulk queries (imports numpy)
+    def values(self, attribute):
+        import numpy as np
+        if attribute not in self.attributes:
+            return None
+        if attribute not in self._arrays:
+            self._arrays[attribute] = np.load(os.path.join(self.path, attribute + ".npy"), mmap_mode="r")
+        return self._arrays[attribute]
+
+    #fxn to get the rows of a pin's arcs present in one corner (empty if the corner does not have the pin)
+    #reads the presence slice of the pin, or the whole mask once it was loaded for a bulk query
+    def corner_rows(self, pin, corner):
+        span = self.pin_rows.get(pin)
+        if span is None:
+            return []
+        start, end = span
+        n = self.n_corners
+        if self._present_all is not None:
+            return [row for row in range(start, end) if self._present_all[row * n + corner]]
+        present = self.present.rows(start, end)
+        return [row for row in range(start, end) if present[(row - start) * n + corner]]
+
+    #fxn to get the (related_pin, mode) signature of every pin present in one corner - the structure, no values read
+    def corner_signatures(self, corner):
+        if self._present_all is None:
+            self._present_all = self.present.rows(0, len(self.arcs))
+        n = self.n_corners
+        index = {}
+        for pin, (start, end) in self.pin_rows.items():
+            sigs = tuple((self.arcs[row][self.rel_idx], self.arcs[row][self.mode_idx])
+                         for row in range(start, end) if self._present_all[row * n + corner])
+            if sigs:
+                index[pin] = sigs
+        return index
+
+    #fxn to rebuild the json-db style arc list of a pin in one corner (None if the corner does not have the pin)
+    def corner_arcs(self, pin, corner):
+        rows = self.corner_rows(pin, corner)
+        if not rows:
+            return None
+        start, end = self.pin_rows[pin]
+        n = self.n_corners
+        blocks = {attribute: self.rows(attribute).rows(start, end) for attribute in self.attributes}
+        arcs = []
+        for row in rows:
+            strings = dict(zip(self.string_fields, self.arcs[row]))
+            strings.update(self.overrides.get(row, {}).get(corner, {}))
+            arc = {}
+            for field in self.fields:
+                if field in strings:
+                    arc[field] = strings[field]
+                else:
+                    value = blocks[field][(row - start) * n + corner]
+                    arc[field] = "N/A" if value != value else value
+            arcs.append(arc)
+        return arcs
+
+    #fxn for attribute_retrieval over all corners of the store: one (arcs x corners) slice per pin instead of a lookup per corner
+    def attribute_retrieval(self, pin, attribute, arc_pin=None, arc_mode=None):
+        n = self.n_corners
+        raw_results = dict.fromkeys(range(n))
+        span = self.pin_rows.get(pin)
+        if span is None:
+            return raw_results
+        start, end = span
+        present = self.present.rows(start, end)
+        reader = self.rows(attribute)
+        block = reader.rows(start, end) if reader is not None else None
+        # related_pin/mode are part of the arc key, so they never differ between corners
+        arcs = [(self.arcs[row][self.rel_idx], self.arcs[row][self.mode_idx]) for row in range(start, end)]
+        for corner in range(n):
+            if not any(present[i * n + corner] for i in range(len(arcs))):
+                continue
+            db_arcs = []
+            for i, (related_pin, mode) in enumerate(arcs):
+                if not present[i * n + corner]:
+                    continue
+                if arc_pin and related_pin != arc_pin:
+                    continue
+                if arc_mode and mode != arc_mode:
+                    continue
+                value = block[i * n + corner] if block is not None else None
+                db_arcs.append({"related_pin": related_pin, "mode": mode, "value": None if value is None or value != value else value})
+            if (arc_pin or arc_mode) and not db_arcs:
+                print(f"[!] Warning: Arc {{ {arc_pin} | {arc_mode} }} not found in DB {corner}")
+            raw_results[corner] = db_arcs
+        return raw_results
+
+    #fxn for build_attribute_matrix over all corners of the store: the attribute's rows are sliced out directly
+    def attribute_matrix(self, attribute, pins=None):
+        import numpy as np
+        spans = [self.pin_rows[pin] + (pin,) for pin in pins if pin in self.pin_rows] if pins else \
+                [span + (pin,) for pin, span in self.pin_rows.items()]
+        arc_keys, rows = [], []
+        for start, end, pin in spans:
+            seen = Counter()
+            for row in range(start, end):
+                base_key = (pin, self.arcs[row][self.rel_idx], self.arcs[row][self.mode_idx])
+                arc_keys.append(base_key + (seen[base_key],))
+                seen[base_key] += 1
+                rows.append(row)
+        values = self.values(attribute)
+        if values is None:
+            return arc_keys, np.full((len(rows), self.n_corners), np.nan)
+        return arc_keys, np.asarray(values[rows] if pins else values[:len(rows)])
+
+class ConsolidatedCornerView:
+    """
+    Dict-like view of one corner of a ConsolidatedStore, answering the same
+    calls as the other lib views. Arc values come back as floats.
+    """
+    def __init__(self, store, corner):
+        self.store = store
+        self.corner = corner
+        self.name = store.corners[corner]["name"]
+        self.pvt = store.corners[corner].get("pvt", {})
+        self._keys = None
+        self._signatures = None
+        self._last = (None, None)
+
+    def _fetch_arcs(self, pin):
+        if self._last[0] != pin:
+            self._last = (pin, self.store.corner_arcs(pin, self.corner))
+        return self._last[1]
+
+    def __contains__(self, pin):
+        # membership only needs the presence mask, not the values
+        if self._keys is not None:
+            return pin in self._signatures
+        return bool(self.store.corner_rows(pin, self.corner))
+
+    def __getitem__(self, pin):
+        arcs = self._fetch_arcs(pin)
+        if arcs is None:
+            raise KeyError(pin)
+        return arcs
+
+    def get(self, pin, default=None):
+        arcs = self._fetch_arcs(pin)
+        return default if arcs is None else arcs
+
+    #fxn to get the (related_pin, mode) arc signature of a pin without reading any values (used by the structural compares)
+    def arc_signatures(self, pin):
+        if self._keys is not None:
+            return self._signatures[pin]
+        store = self.store
+        return tuple((store.arcs[row][store.rel_idx], store.arcs[row][store.mode_idx]) for row in store.corner_rows(pin, self.corner))
+
+    def keys(self):
+        if self._keys is None:
+            self._signatures = self.store.corner_signatures(self.corner)
+            self._keys = list(self._signatures)
+        return self._keys
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+#fxn to open a consolidated store - returns one ConsolidatedCornerView per corner, in the store's corner order
+def load_consolidated_database(store_path):
+    try:
+        store = ConsolidatedStore(store_path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {store_path} is not a valid consolidated db: {e}")
+        return []
+    return [ConsolidatedCornerView(store, corner) for corner in range(len(store.corners))]
+
+#fxn to get the ConsolidatedStore behind a db list when it is exactly all corners of one store, in order (else None)
+#queries use it to read a pin's values over all corners as one slice
+def consolidated_store(databases):
+    store = getattr(databases[0], "store", None) if databases else None
+    if store is None or len(databases) != len(store.corners):
+        return None
+    if all(getattr(db, "store", None) is store and db.corner == corner for corner, db in enumerate(databases)):
+        return store
+    return None
+
+#fxn to tell whether a path is a consolidated store directory
+def is_consolidated_store(path):
+    return os.path.isfile(os.path.join(path, CONSOLIDATED_STRUCTURE))
+
+#json db file suffixes: .json (pretty or compact) and .ndjson (one {pin: arcs} object per line)
+JSON_DB_SUFFIXES = (".json", ".ndjson")
+
+# tokens that matter for locating top-level values in a json db file: strings (with escapes) and structural characters
+re_json_token = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{},:]')
+
+#fxn to scan a json db file once and map every top-level pin key to the (start, end) byte span of its value
+#works on any json layout (indented, compact or ndjson) via mmap, so the file is never decoded in full
+def build_pin_index(json_path):
+    index = {}
+    if os.path.getsize(json_path) == 0:
+        raise ValueError("empty file")
+    with open(json_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        depth = 0
+        key = None
+        value_start = None
+        for m in re_json_token.finditer(mm):
+            tok = m.group()
+            if tok[0] == 0x22:  # '"'
+                if depth == 1 and key is None:
+                    key = tok
+                continue
+            if depth == 1:
+                if tok == b':':
+                    value_start = m.end()
+                    continue
+                if tok == b',' or tok == b'}':
+                    if key is not None:
+                        index[json.loads(key)] = (value_start, m.start())
+                    key = None
+            if tok == b'{' or tok == b'[':
+                depth += 1
+            elif tok == b'}' or tok == b']':
+                depth -= 1
+        if depth != 0:
+            raise ValueError("unbalanced json object")
+    return index
+
+#fxn to load the pin index of a json db from its sidecar (<db>.json.idx), rebuilding it when the db changed
+def load_pin_index(json_path):
+    index_path = json_path + ".idx"
+    st = os.stat(json_path)
+    try:
+        with open(index_path, 'r') as f:
+            cached = json.load(f)
+        if cached["size"] == st.st_size and cached["mtime"] == st.st_mtime:
+            return {pin: tuple(span) for pin, span in cached["pins"]}
+    except (OSError, ValueError, KeyError):
+        pass
+
+    index = build_pin_index(json_path)
+    try:
+        with open(index_path, 'w') as f:
+            # pins stored as a list to keep the db's key order
+            json.dump({"size": st.st_size, "mtime": st.st_mtime, "pins": list(index.items())}, f)
+    except OSError:
+        pass  # read-only db folder - the index just lives in memory for this run
+    return index
+
+#json db hash tree sidecar suffix (<db>.json.hash) - the tree itself is built the same way as in ip-db-gen-script.py
+HASH_SIDECAR_SUFFIX = ".hash"
+
+#fxn to hash one node of the db hash tree (8-byte blake2b, hex)
+def node_hash(text):
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+#fxn to hash one json db arc entry: its compact json text, in stored key order
+def arc_hash(arc_entry):
+    return node_hash(json.dumps(arc_entry, separators=(',', ':')))
+
+#fxn to build the hash tree of a db from its arc hashes: {"lib": hash, "pins": {pin: [pin hash, [arc hashes]]}}
+def build_hash_tree(arc_hashes):
+    pins = {pin: [node_hash("".join(hashes)), hashes] for pin, hashes in arc_hashes.items()}
+    lib = node_hash("".join(f"{pin}\0{pins[pin][0]}\n" for pin in sorted(pins)))
+    return {"lib": lib, "pins": pins}
+
+#fxn to load the hash tree of a json db from its sidecar, recomputing it (one full decode) when the
+#sidecar is missing (db from an older gen script) or stale (db changed or copied without its mtime)
+def load_hash_tree(json_path):
+    sidecar_path = json_path + HASH_SIDECAR_SUFFIX
+    st = os.stat(json_path)
+    try:
+        with open(sidecar_path, 'r') as f:
+            cached = json.load(f)
+        if cached["size"] == st.st_size and cached["mtime"] == st.st_mtime:
+            return cached
+    except (OSError, ValueError, KeyError):
+        pass
+
+    db, _, _ = load_json_file(json_path)
+    tree = build_hash_tree({pin: [arc_hash(a) for a in arcs] for pin, arcs in db.items()})
+    try:
+        with open(sidecar_path, 'w') as f:
+            json.dump({"size": st.st_size, "mtime": st.st_mtime, **tree}, f, separators=(',', ':'))
+    except OSError:
+        pass  # read-only db folder - recomputed on every diff
+    return tree
+
+class JsonLibView:
+    """
+    Lazy, dict-like view of one json db file. Only the pin -> byte span
+    index is held in memory; `db[pin]` seeks to the pin's span and decodes
+    just that arc list. Supports the same calls as SqliteLibView, and
+    caches the last looked-up pin.
+    """
+    def __init__(self, json_path):
+        self.json_path = json_path
+        self.pin_index = load_pin_index(json_path)
+        self._last = (None, None)
+
+    def _fetch_arcs(self, pin):
+        if self._last[0] == pin:
+            return self._last[1]
+        span = self.pin_index.get(pin)
+        arcs = None
+        if span is not None:
+            with open(self.json_path, 'rb') as f:
+                f.seek(span[0])
+                arcs = json.loads(f.read(span[1] - span[0]))
+        self._last = (pin, arcs)
+        return arcs
+
+    def __contains__(self, pin):
+        return pin in self.pin_index
+
+    def __getitem__(self, pin):
+        if pin not in self.pin_index:
+            raise KeyError(pin)
+        return self._fetch_arcs(pin)
+
+    def get(self, pin, default=None):
+        if pin not in self.pin_index:
+            return default
+        return self._fetch_arcs(pin)
+
+    def keys(self):
+        return list(self.pin_index)
+
+    def __iter__(self):
+        return iter(self.pin_index)
+
+    def __len__(self):
+        return len(self.pin_index)
+
+#fxn to fully decode one json db file - returns (db, seconds, bytes); module level so pool workers can pickle it
+#with fields, every arc is cut down to those fields (see load_database)
+def load_json_file(filepath, fields=None):
+    # optional faster json decoder; falls back to the stdlib json module
+    try:
+        from orjson import loads as json_loads
+    except ImportError:
+        json_loads = json.loads
+    start = time.perf_counter()
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    if not filepath.endswith(".ndjson"):
+        db = json_loads(raw)
+    else:
+        db = {}
+        for line in raw.splitlines():
+            if line.strip():
+                for pin, arcs in json_loads(line).items():
+                    db.setdefault(pin, []).extend(arcs)
+    if fields:
+        db = {pin: [{k: a[k] for k in fields if k in a} for a in arcs] for pin, arcs in db.items()}
+    return db, time.perf_counter() - start, len(raw)
+
+def load_database(db_folderpath, lazy=False, jobs=1, report=False, fields=None):
+    #fxn to load all db files (.json/.ndjson format) - returns a list of all .json files within target db folder
+    #a sqlite db file (from ip-db-gen-script.py --sqlite) is opened as lazy per-lib views instead, and so is
+    #a consolidated store directory (--consolidate; one view per corner)
+    #with lazy=True each json file becomes a JsonLibView: pins are decoded on demand, so memory follows the query
+    #full loads are spread over `jobs` worker processes; the returned list keeps the sorted filename order either way
+    #every decoded db is pickled back from its worker, and unpickling a full db costs the parent about half a json decode,
+    #so with fields (the arc fields the query reads) workers send back arcs cut down to those fields only
     all_databases = []    
+    if os.path.isfile(db_folderpath) and db_folderpath.endswith((".sqlite", ".db")):
+        return load_sqlite_database(db_folderpath)
+    if is_consolidated_store(db_folderpath):
+        return load_consolidated_database(db_folderpath)
+
     if not os.path.isdir(db_folderpath):
         print(f"Error: {db_folderpath} is not a valid directory.")
         return all_databases
 
     # sort files to ensure consistent order during DFS traversal/comparison
-    filenames = sorted([f for f in os.listdir(db_folderpath) if f.endswith('.json')])
+    filenames = sorted([f for f in os.listdir(db_folderpath) if f.endswith(JSON_DB_SUFFIXES)])
 
-    for filename in filenames:
-        filepath = os.path.join(db_folderpath, filename)
-        try:
-            with open(filepath, 'r') as f:
-                all_databases.append(json.load(f))
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Error: Skipping {filename} due to load error: {e}")                
+    if lazy:
+        for filename in filenames:
+            filepath = os.path.join(db_folderpath, filename)
+            try:
+                all_databases.append(JsonLibView(filepath))
+            except (FileNotFoundError, ValueError) as e:
+                print(f"Error: Skipping {filename} due to load error: {e}")
+        return all_databases
+
+    filepaths = [os.path.join(db_folderpath, filename) for filename in filenames]
+    start = time.perf_counter()
+    if jobs > 1 and len(filepaths) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(load_json_file, filepath, fields) for filepath in filepaths]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except (FileNotFoundError, ValueError) as e:
+                    results.append(e)
+    else:
+        results = []
+        for filepath in filepaths:
+            try:
+                results.append(load_json_file(filepath))
+            except (FileNotFoundError, ValueError) as e:
+                results.append(e)
+
+    total_bytes = 0
+    for filename, result in zip(filenames, results):
+        if isinstance(result, Exception):
+            print(f"Error: Skipping {filename} due to load error: {result}")
+            continue
+        db, seconds, n_bytes = result
+        total_bytes += n_bytes
+        all_databases.append(db)
+        if report:
+            print(f"  loaded {filename}: {n_bytes / 1e6:.2f} MB in {seconds:.3f}s")
+    if report:
+        elapsed = time.perf_counter() - start
+        print(f"Loaded {total_bytes / 1e6:.2f} MB from {len(all_databases)} file(s) in {elapsed:.3f}s with {max(jobs, 1)} worker(s)")
     return all_databases
 
-def db_compare_arc(databases, start_pin, visited=None, depth=0):
- #fxn to compare arcs for a given pin across all DBs
+#fxn to get the arc signatures of a pin in one db: (related_pin, mode) per arc, in stored order
+def arc_signatures(db, pin):
+    # sqlite and consolidated store views know the signatures from the structure alone
+    if hasattr(db, "arc_signatures"):
+        return db.arc_signatures(pin)
+    return tuple((a.get("related_pin"), a.get("mode")) for a in db[pin])
+
+#fxn to compare the arc chains reachable from start_pin across all DBs, iteratively (explicit stack, no recursion limit)
+#every pin is checked once against the first DB that has it; returns (mismatches, pins checked, arcs checked)
+#each DB's signatures are only built for the pins the walk reaches, so a single chain on lazy views decodes just those
+#pins (--compare --all builds the full per-DB index up front instead, see build_arc_index/db_compare_all)
+#mismatch types: invalid_pin, missing_pin, missing_arcs, extra_arcs, arc_order - each with the diverging DB indices
+def compare_arc_chains(databases, start_pin, visited=None):
     if visited is None:
         visited = set()
-    indent = "  " * depth
+    mismatches = []
+    pins_checked = arcs_checked = 0
 
-    if start_pin == "N/A":
-        return True
+    if start_pin == "N/A" or start_pin in visited:
+        return mismatches, pins_checked, arcs_checked
 
-    pin_exists_anywhere = any(start_pin in db for db in databases)
+    stack = [start_pin]
+    while stack:
+        pin = stack.pop()
+        if pin in visited or pin == "N/A":
+            continue
+        visited.add(pin)
 
-    if not pin_exists_anywhere:
-        if len(visited) == 0:
-            # Case A: User gave an invalid starting pin
-            print(f"[!] ERROR: Starting pin '{start_pin}' is invalid (not found in any DB).")
-            return False
-        else:
-            # Case B: Reached a terminal related_pin (standard leaf node)
-            print(f"{indent}[RELATED_PIN] {start_pin}")
-            return True
-
-    # prevent infinite traversal
-    if start_pin in visited:
-        print(f"{indent}PIN: {start_pin} (Already visited, skipping)")
-        return True
-
-    # consistency check: verify if given start_pin is in ALL databases
-    if not all(start_pin in db for db in databases):
-        print(f"{indent}PIN: {start_pin}")
-        print(f"{indent}  [!] ERROR: Structural Mismatch. Pin missing in some DBs.")
-        return False
-
-    print(f"{indent}PIN: {start_pin}")
-    visited.add(start_pin)
-
-    # get all arc lists for this pin from all databases
-    all_arc_lists = [db[start_pin] for db in databases]
-    
-    # check if all databases have the same number of arcs
-    num_arcs_per_db = []
-    for db_arcs in all_arc_lists:
-        num_arcs_per_db.append(len(db_arcs))
-    
-    first_count = num_arcs_per_db[0]
-    all_same_count = True
-    for count in num_arcs_per_db:
-        if count != first_count:
-            all_same_count = False
-            break
-    
-    if not all_same_count:
-        print(f"{indent}  [!] ERROR: Arc count mismatch.")
-        print(f"{indent}      Arc counts: {num_arcs_per_db}")
-        return False
-
-    num_arcs = len(all_arc_lists[0])
-
-    for arc_index in range(num_arcs):
-        # collect all related_pins at this arc position
-        pins_at_this_arc = []
-        for db_arcs in all_arc_lists:
-            pin = db_arcs[arc_index].get("related_pin")
-            pins_at_this_arc.append(pin)
-        
-        # check if they're all the same
-        first_pin = pins_at_this_arc[0]
-        all_same = True
-        
-        for pin in pins_at_this_arc:
-            if pin != first_pin:
-                all_same = False
-                break
-        
-        if not all_same:
-            print(f"{indent}  [!] PATH MISMATCH at arc {arc_index}")
-            print(f"{indent}      Found: {pins_at_this_arc}")
-            return False
+        present = [idx for idx, db in enumerate(databases) if pin in db]
+        if not present:
+            # a start pin nobody knows is an error; a related_pin nobody knows is a terminal leaf
+            if pin == start_pin:
+                mismatches.append({"pin": pin, "type": "invalid_pin", "dbs": []})
+            continue
+        pins_checked += 1
 
-        next_pin = first_pin
-        print(f"{indent}  [Arc {arc_index}] {start_pin} ---> {next_pin}")
-        
-        # recurse to trace full path
-        if next_pin and next_pin != "N/A":
-            if not db_compare_arc(databases, next_pin, visited, depth + 1):
-                return False
-        else:
-            print(f"{indent}    [RELATED_PIN] N/A")
-    return True
+        if len(present) != len(databases):
+            present_set = set(present)
+            missing = [idx for idx in range(len(databases)) if idx not in present_set]
+            mismatches.append({"pin": pin, "type": "missing_pin", "dbs": missing})
+
+        ref_idx = present[0]
+        ref_sigs = arc_signatures(databases[ref_idx], pin)
+        ref_counts = None
+        # related pins in stored arc order (reference db first, then new ones from the others), so the walk
+        # and the order of reported mismatches are the same on every run
+        related = dict.fromkeys(sig[0] for sig in ref_sigs)
+        arcs_checked += len(ref_sigs) * len(present)
+
+        for idx in present[1:]:
+            sigs = arc_signatures(databases[idx], pin)
+            if sigs == ref_sigs:
+                continue
+            # slow path: work out what actually differs, keyed by (related_pin, mode)
+            if ref_counts is None:
+                ref_counts = Counter(ref_sigs)
+            counts = Counter(sigs)
+            related.update(dict.fromkeys(sig[0] for sig in sigs))
+            if counts == ref_counts:
+                mismatches.append({"pin": pin, "type": "arc_order", "dbs": [idx], "reference_db": ref_idx})
+                continue
+            missing_arcs = sorted((ref_counts - counts).elements(), key=str)
+            extra_arcs = sorted((counts - ref_counts).elements(), key=str)
+            if missing_arcs:
+                mismatches.append({"pin": pin, "type": "missing_arcs", "dbs": [idx], "reference_db": ref_idx, "arcs": missing_arcs})
+            if extra_arcs:
+                mismatches.append({"pin": pin, "type": "extra_arcs", "dbs": [idx], "reference_db": ref_idx, "arcs": extra_arcs})
+
+        # pushed in reverse so the depth-first walk follows arc order
+        for next_pin in reversed(related):
+            if next_pin and next_pin not in visited:
+                stack.append(next_pin)
+
+    return mismatches, pins_checked, arcs_checked
+
+#fxn to print one mismatch found by compare_arc_chains
+def mismatch_print_pretty(mismatch):
+    pin, kind, dbs = mismatch["pin"], mismatch["type"], mismatch["dbs"]
+    if kind == "invalid_pin":
+        print(f"  [!] ERROR: Starting pin '{pin}' is invalid (not found in any DB).")
+    elif kind == "missing_pin":
+        print(f"  [!] PIN {pin}: missing in DB(s) {dbs}")
+    elif kind == "arc_order":
+        print(f"  [!] PIN {pin}: DB {dbs[0]} has the same arcs as DB {mismatch['reference_db']} in a different order")
+    else:
+        arcs = ", ".join(f"{{{rp} | {mode}}}" for rp, mode in mismatch["arcs"])
+        label = "missing arcs" if kind == "missing_arcs" else "extra arcs"
+        print(f"  [!] PIN {pin}: DB {dbs[0]} {label} vs DB {mismatch['reference_db']}: {arcs}")
+
+#fxn to build the arc signature index of one db: pin -> tuple of (related_pin, mode), in stored order
+def build_arc_index(db):
+    return {pin: arc_signatures(db, pin) for pin in db.keys()}
+
+#fxn to check structural equivalence of all pins of all DBs in one bulk pass
+#each pin's DBs are grouped by identical arc signature; the largest group is the reference and every other DB is
+#reported against it. returns a flat list of mismatch rows (one per pin/db/arc), ready for a json or csv report
+def db_compare_all(databases):
+    indexes = [build_arc_index(db) for db in databases]
+    all_pins = set().union(*indexes)
+    # preserve the first DB's pin order, then any pins only other DBs have
+    ordered_pins = list(indexes[0]) + sorted(all_pins - set(indexes[0])) if indexes else []
+
+    rows = []
+    for pin in ordered_pins:
+        groups = {}
+        for idx, index in enumerate(indexes):
+            sigs = index.get(pin)
+            if sigs is not None:
+                groups.setdefault(sigs, []).append(idx)
+
+        present = sum(len(dbs) for dbs in groups.values())
+        if present != len(indexes):
+            for idx, index in enumerate(indexes):
+                if pin not in index:
+                    rows.append({"pin": pin, "type": "missing_pin", "db": idx, "reference_db": None, "related_pin": None, "mode": None})
+        if len(groups) <= 1:
+            continue
+
+        ref_sigs, ref_dbs = max(groups.items(), key=lambda item: (len(item[1]), -item[1][0]))
+        ref_counts = Counter(ref_sigs)
+        for sigs, dbs in groups.items():
+            if sigs == ref_sigs:
+                continue
+            counts = Counter(sigs)
+            if counts == ref_counts:
+                diffs = [("arc_order", None, None)]
+            else:
+                diffs = [("missing_arc", rp, mode) for rp, mode in (ref_counts - counts).elements()]
+                diffs += [("extra_arc", rp, mode) for rp, mode in (counts - ref_counts).elements()]
+            for idx in dbs:
+                for kind, rp, mode in diffs:
+                    rows.append({"pin": pin, "type": kind, "db": idx, "reference_db": ref_dbs[0], "related_pin": rp, "mode": mode})
+    return rows
+
+#fxn to write the db_compare_all mismatch rows as a json (.json) or csv (any other suffix) report
+def write_mismatch_report(rows, report_path, db_count):
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    if report_path.endswith(".json"):
+        with open(report_path, 'w') as f:
+            json.dump({"db_count": db_count, "mismatch_count": len(rows), "mismatches": rows}, f, indent=1)
+    else:
+        with open(report_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=["pin", "type", "db", "reference_db", "related_pin", "mode"])
+            writer.writeheader()
+            writer.writerows(rows)
+    print(f"Mismatch report written to: {report_path}")
+
+#fxn to actually run the bulk structural diff for --compare --all
+def run_compare_all(all_dbs, report_path=None):
+    print("\n" + "="*50)
+    print("STARTING BULK STRUCTURAL CHECK (ALL PINS, ALL DBS)")
+    print("="*50)
+
+    rows = db_compare_all(all_dbs)
+
+    # summary per DB: how many pins it diverges on
+    diverging = {}
+    for row in rows:
+        diverging.setdefault(row["db"], set()).add(row["pin"])
+    for idx in sorted(diverging):
+        print(f"  [!] DB Index {idx}: diverges on {len(diverging[idx])} pin(s)")
+
+    if report_path:
+        write_mismatch_report(rows, report_path, len(all_dbs))
+
+    print("\n" + "="*50)
+    print("ALL PINS CONSISTENT" if not rows else f"STRUCTURAL MISMATCH DETECTED ({len(rows)} mismatch row(s))")
+    print("="*50)
+
+#fxn to key the arcs of a pin by (related_pin, mode, occurrence), in stored order - the arc keys of build_attribute_matrix
+def arc_keys(arcs):
+    seen = Counter()
+    keys = []
+    for a in arcs:
+        base_key = (a.get("related_pin", "N/A"), a.get("mode", "N/A"))
+        keys.append(base_key + (seen[base_key],))
+        seen[base_key] += 1
+    return keys
+
+#fxn to list what changed between two versions of one arc: (field, old, new, delta) - delta is None for non-numeric values
+#lookup tables (--tables) are compared per table, without a delta
+def arc_field_changes(old_arc, new_arc):
+    changes = []
+    for field in list(new_arc) + [f for f in old_arc if f not in new_arc]:
+        old_value, new_value = old_arc.get(field, "N/A"), new_arc.get(field, "N/A")
+        if old_value == new_value:
+            continue
+        if field == "tables":
+            old_tables, new_tables = old_value if isinstance(old_value, dict) else {}, new_value if isinstance(new_value, dict) else {}
+            for name in sorted(set(old_tables) | set(new_tables)):
+                if old_tables.get(name) != new_tables.get(name):
+                    changes.append((f"tables/{name}", None, None, None))
+            continue
+        try:
+            delta = float(new_value) - float(old_value)
+        except (ValueError, TypeError):
+            delta = None
+        changes.append((field, old_value, new_value, delta))
+    return changes
+
+#fxn to map lib name -> json db path for a db folder (one db per lib, as consolidate_db_dir expects)
+def list_json_dbs(db_folderpath):
+    if not os.path.isdir(db_folderpath) or is_consolidated_store(db_folderpath):
+        sys.exit(f"Error: --diff compares json db folders; {db_folderpath} is not one.")
+    dbs = {}
+    for filename in sorted(os.listdir(db_folderpath)):
+        if filename.endswith(JSON_DB_SUFFIXES):
+            dbs.setdefault(filename.rsplit(".", 1)[0], os.path.join(db_folderpath, filename))
+    return dbs
+
+#fxn to diff a db folder against a baseline folder (e.g. the previous release), lib by lib via the db hash trees:
+#a lib with the same lib hash is skipped whole, a pin with the same pin hash is skipped without being decoded,
+#and only the arcs of changed pins whose arc hash differs are compared field by field
+#returns (rows, counts); rows are the compact change list - one row per added/removed lib, pin or arc, or changed field
+def diff_db_folders(db_folderpath, baseline_folderpath):
+    new_dbs, old_dbs = list_json_dbs(db_folderpath), list_json_dbs(baseline_folderpath)
+    rows = []
+    counts = Counter()
+
+    def row(lib, kind, pin=None, key=(None, None, None), field=None, old=None, new=None, delta=None):
+        rows.append({"lib": lib, "type": kind, "pin": pin, "related_pin": key[0], "mode": key[1],
+                     "field": field, "old": old, "new": new, "delta": delta})
+
+    for lib in sorted(set(new_dbs) | set(old_dbs)):
+        if lib not in old_dbs:
+            row(lib, "added_lib")
+            continue
+        if lib not in new_dbs:
+            row(lib, "removed_lib")
+            continue
+        counts["libs"] += 1
+        new_tree, old_tree = load_hash_tree(new_dbs[lib]), load_hash_tree(old_dbs[lib])
+        if new_tree["lib"] == old_tree["lib"]:
+            counts["libs_unchanged"] += 1
+            counts["pins_unchanged"] += len(new_tree["pins"])
+            continue
+
+        new_pins, old_pins = new_tree["pins"], old_tree["pins"]
+        new_view = old_view = None
+        for pin, (pin_hash, arc_hashes) in new_pins.items():
+            if pin not in old_pins:
+                row(lib, "added_pin", pin)
+                continue
+            old_pin_hash, old_arc_hashes = old_pins[pin]
+            if pin_hash == old_pin_hash:
+                counts["pins_unchanged"] += 1
+                continue
+            counts["pins_changed"] += 1
+            if new_view is None:
+                new_view, old_view = JsonLibView(new_dbs[lib]), JsonLibView(old_dbs[lib])
+            new_arcs, old_arcs = new_view[pin], old_view[pin]
+            old_by_key = {key: (h, a) for key, h, a in zip(arc_keys(old_arcs), old_arc_hashes, old_arcs)}
+            for key, h, arc in zip(arc_keys(new_arcs), arc_hashes, new_arcs):
+                old = old_by_key.pop(key, None)
+                if old is None:
+                    row(lib, "added_arc", pin, key)
+                elif old[0] != h:
+                    counts["arcs_changed"] += 1
+                    for field, old_value, new_value, delta in arc_field_changes(old[1], arc):
+                        row(lib, "changed", pin, key, field, old_value, new_value, delta)
+            for key in old_by_key:
+                row(lib, "removed_arc", pin, key)
+        for pin in old_pins:
+            if pin not in new_pins:
+                row(lib, "removed_pin", pin)
+    return rows, counts
+
+#diff report columns, one row per change (see diff_db_folders)
+DIFF_FIELDS = ["lib", "type", "pin", "related_pin", "mode", "field", "old", "new", "delta"]
+
+#fxn to write the diff rows as a json (.json) or csv (any other suffix) report
+def write_diff_report(rows, report_path, counts):
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    if report_path.endswith(".json"):
+        with open(report_path, 'w') as f:
+            json.dump({"summary": dict(counts), "change_count": len(rows), "changes": rows}, f, indent=1)
+    else:
+        with open(report_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=DIFF_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    print(f"Diff report written to: {report_path}")
+
+#fxn to run --diff: summary per lib, the largest numeric changes and the structural ones, optionally the full report
+def run_db_diff(db_folderpath, baseline_folderpath, report_path=None, top=20):
+    print("\n" + "="*60)
+    print(f"RELEASE DIFF: {db_folderpath} vs baseline {baseline_folderpath}")
+    print("="*60)
+
+    start = time.perf_counter()
+    rows, counts = diff_db_folders(db_folderpath, baseline_folderpath)
+    elapsed = time.perf_counter() - start
 
-def db_compare_all():
+    per_lib = {}
+    for r in rows:
+        per_lib.setdefault(r["lib"], Counter())[r["type"]] += 1
+    for lib, kinds in per_lib.items():
+        print(f"  [~] {lib}: " + ", ".join(f"{n} {kind.replace('_', ' ')}" for kind, n in sorted(kinds.items())))
 
-    pass
+    # numeric changes ranked by size, largest first
+    numeric = sorted((r for r in rows if r["delta"] is not None), key=lambda r: -abs(r["delta"]))
+    if numeric:
+        print(f"\nLargest value changes ({min(top, len(numeric))} of {len(numeric)}):")
+        for r in numeric[:top]:
+            print(f"  {r['lib']}: {r['pin']} {{{r['related_pin']} | {r['mode']}}} {r['field']}: {r['old']} -> {r['new']} ({r['delta']:+.6g})")
+    other = [r for r in rows if r["delta"] is None and r["type"] == "changed"]
+    for r in other[:top]:
+        print(f"  {r['lib']}: {r['pin']} {{{r['related_pin']} | {r['mode']}}} {r['field']}: {r['old']} -> {r['new']}")
+
+    if report_path:
+        write_diff_report(rows, report_path, counts)
+
+    print(f"\n{counts['libs']} lib(s) compared in {elapsed:.3f}s: {counts['libs_unchanged']} unchanged, "
+          f"{counts['pins_unchanged']} pin(s) skipped by hash, {counts['pins_changed']} pin(s) / {counts['arcs_changed']} arc(s) changed")
+    print("="*60)
+    print("NO CHANGES" if not rows else f"CHANGES DETECTED ({len(rows)} change row(s))")
+    print("="*60)
 
 def attribute_retrieval(databases, start_pin, target_attribute, arc_pin=None, arc_mode=None):
+    store = consolidated_store(databases)
+    if store is not None:
+        return store.attribute_retrieval(start_pin, target_attribute, arc_pin, arc_mode)
     raw_results = {}
     for idx, db in enumerate(databases):
         arcs = db.get(start_pin)
@@ -151,6 +951,105 @@ def attribute_retrieval(databases, start_pin, target_attribute, arc_pin=None, ar
         raw_results[idx] = db_arcs
     return raw_results
 
+#fxn to stack raw (base64-decoded) little-endian float32 arrays of one length n into a (T, n) float64 matrix in one call
+def stack_arrays(raw_arrays, n):
+    import numpy as np
+    return np.frombuffer(b"".join(raw_arrays), dtype='<f4').astype(np.float64).reshape(len(raw_arrays), n)
+
+#fxn to bilinearly interpolate a stack of same-shape tables at a set of operating points in one vectorized call
+#axis_1: (T, n1), axis_2: (T, n2), values: (T, n1, n2), x/y: (P,) -> returns (T, P); points outside the axes are extrapolated linearly
+def bilinear_interpolate(axis_1, axis_2, values, x, y):
+    import numpy as np
+    n1, n2 = values.shape[1], values.shape[2]
+    rows = np.arange(values.shape[0])[:, None]
+
+    def bracket(axis, pts, n):
+        # lower grid index per (table, point), clipped so that [i, i+1] is always a valid cell
+        i = np.clip((axis[:, None, :] <= pts[None, :, None]).sum(axis=2) - 1, 0, max(n - 2, 0))
+        i_next = np.minimum(i + 1, n - 1)
+        lo, hi = np.take_along_axis(axis, i, axis=1), np.take_along_axis(axis, i_next, axis=1)
+        span = hi - lo
+        w = np.divide(pts[None, :] - lo, span, out=np.zeros_like(lo), where=span != 0)
+        return i, i_next, w
+
+    i, i_next, wx = bracket(axis_1, x, n1)
+    j, j_next, wy = bracket(axis_2, y, n2)
+
+    v00, v01 = values[rows, i, j], values[rows, i, j_next]
+    v10, v11 = values[rows, i_next, j], values[rows, i_next, j_next]
+    return (1 - wx) * ((1 - wy) * v00 + wy * v01) + wx * ((1 - wy) * v10 + wy * v11)
+
+#fxn to interpolate the full lookup table of an attribute at user operating points (index_1, index_2), for every matched arc
+#of every given pin in every DB; tables of all pins are batched by shape, so each shape is interpolated in one call
+#returns {pin: {db_idx: [arc, ...]}} - per pin the same layout as attribute_retrieval, "value" being a list of per-point values
+def table_interpolation(databases, pins, target_attribute, points, arc_pin=None, arc_mode=None):
+    import numpy as np
+    x = np.array([p[0] for p in points], dtype=np.float64)
+    y = np.array([p[1] for p in points], dtype=np.float64)
+
+    results = {}
+    # shape -> (arc results, raw index_1, raw index_2, raw values); tables are only base64-decoded here,
+    # the float conversion happens once per batch
+    batches = {}
+    for pin in pins:
+        raw_results = results[pin] = {}
+        for idx, db in enumerate(databases):
+            arcs = db.get(pin)
+            if arcs is None:
+                raw_results[idx] = None
+                continue
+
+            db_arcs = []
+            for a in arcs:
+                if arc_pin and a.get("related_pin") != arc_pin:
+                    continue
+                if arc_mode and a.get("mode") != arc_mode:
+                    continue
+
+                arc_result = {
+                    "related_pin": a.get("related_pin", "N/A"),
+                    "mode": a.get("mode", "N/A"),
+                    "value": None
+                }
+                db_arcs.append(arc_result)
+
+                table = a.get("tables", {}).get(target_attribute)
+                if not table:
+                    continue
+                shape = tuple(table["shape"])
+                values = base64.b64decode(table["values"])
+                axis_1 = base64.b64decode(table["index_1"]) if "index_1" in table else None
+                # 1-D tables get a single dummy column so they share the 2-D code path
+                axis_2 = base64.b64decode(table["index_2"]) if len(shape) == 2 and "index_2" in table else None
+                n1 = len(axis_1) // 4 if axis_1 is not None else 0
+                n2 = len(axis_2) // 4 if axis_2 is not None else 1
+                # the gen script falls back to a flat [len(values)] shape when the axes do not match the values
+                if axis_1 is None or len(shape) not in (1, 2) or shape != (n1, n2)[:len(shape)] or len(values) // 4 != n1 * n2:
+                    problem = "has no index_1 axis" if axis_1 is None else f"axes do not match its values (shape {list(shape)})"
+                    arc_result["note"] = f"table {problem}, not interpolated"
+                    print(f"[!] Warning: DB {idx} pin {pin} arc {{ {arc_result['related_pin']} | {arc_result['mode']} }}: {target_attribute} {arc_result['note']}")
+                    continue
+                batch = batches.setdefault(shape, ([], [], [], []))
+                batch[0].append(arc_result)
+                batch[1].append(axis_1)
+                batch[2].append(axis_2)
+                batch[3].append(values)
+
+            if (arc_pin or arc_mode) and not db_arcs:
+                print(f"[!] Warning: Arc {{ {arc_pin} | {arc_mode} }} not found for pin {pin} in DB {idx}")
+
+            raw_results[idx] = db_arcs
+
+    for shape, (arc_results, axes_1, axes_2, values) in batches.items():
+        n1, n2 = shape[0], shape[1] if len(shape) == 2 else 1
+        axis_2 = stack_arrays(axes_2, n2) if len(shape) == 2 else np.zeros((len(arc_results), 1))
+        interpolated = bilinear_interpolate(
+            stack_arrays(axes_1, n1), axis_2, stack_arrays(values, n1 * n2).reshape(-1, n1, n2), x, y
+        )
+        for arc_result, row in zip(arc_results, interpolated.tolist()):
+            arc_result["value"] = row
+    return results
+
 #fxn to print retrieed attributes
 def attribute_print_pretty(data_map, start_pin, target_attribute):
     print(f"\nAttribute Retrieval for Pin: {start_pin}")
@@ -170,6 +1069,25 @@ def attribute_print_pretty(data_map, start_pin, target_attribute):
 
 
 
+#fxn to draw the spread histogram of a list of values onto a new figure (shared by the interactive and batch modes)
+def draw_spread_histogram(numeric_values, target_attribute, label):
+    plt = load_pyplot()
+    v_min, v_max = min(numeric_values), max(numeric_values)
+
+    fig = plt.figure(figsize=(10, 6))
+    plt.hist(numeric_values, bins='auto', color='#3498db', edgecolor='black', alpha=0.8)
+    
+    # Visual cues: vertical lines for Min/Max
+    plt.axvline(v_min, color='red', linestyle='dashed', linewidth=1, label=f'Min: {v_min:.4f}')
+    plt.axvline(v_max, color='green', linestyle='dashed', linewidth=1, label=f'Max: {v_max:.4f}')
+    
+    plt.title(f"Histogram of {target_attribute}\n{label}")
+    plt.xlabel("Attribute Value")
+    plt.ylabel("Frequency (Arc Occurrences)")
+    plt.legend()
+    plt.grid(axis='y', alpha=0.3)    
+    return fig
+
 def attribute_spread(databases, start_pin, target_attribute, arc_pin=None, arc_mode=None):
     data_map = attribute_retrieval(databases, start_pin, target_attribute, arc_pin, arc_mode)
     
@@ -195,19 +1113,8 @@ def attribute_spread(databases, start_pin, target_attribute, arc_pin=None, arc_m
     print("="*40 + "\n")
 
     #Histogram Generation
-    plt.figure(figsize=(10, 6))
-    plt.hist(numeric_values, bins='auto', color='#3498db', edgecolor='black', alpha=0.8)
-    
-    # Visual cues: vertical lines for Min/Max
-    plt.axvline(v_min, color='red', linestyle='dashed', linewidth=1, label=f'Min: {v_min:.4f}')
-    plt.axvline(v_max, color='green', linestyle='dashed', linewidth=1, label=f'Max: {v_max:.4f}')
-    
-    plt.title(f"Histogram of {target_attribute}\nPin: {start_pin}")
-    plt.xlabel("Attribute Value")
-    plt.ylabel("Frequency (Arc Occurrences)")
-    plt.legend()
-    plt.grid(axis='y', alpha=0.3)    
-    plt.show()
+    draw_spread_histogram(numeric_values, target_attribute, f"Pin: {start_pin}")
+    load_pyplot().show()
 
 #fxn to actually run the comparison across all DBs for the arcs of given input pins (input pins may be a pin list or single pin)  
 def run_comparison(all_dbs, target_pins):
@@ -226,18 +1133,86 @@ def run_comparison(all_dbs, target_pins):
             if start_pin not in global_visited:
                 print(f"\n--- Tracing Arc Chain for: {start_pin} ---")                
                 # use global_visited to mark every node in the path as "processed"
-                is_consistent = db_compare_arc(all_dbs, start_pin, visited=global_visited, depth=0)
+                mismatches, pins_checked, arcs_checked = compare_arc_chains(all_dbs, start_pin, visited=global_visited)
+                for mismatch in mismatches:
+                    mismatch_print_pretty(mismatch)
                 
-                if not is_consistent:
+                if mismatches:
                     overall_trace_success = False
-                    print(f"Result: [FAILED] Discrepancy found starting at {start_pin}") #might add debug path for failing/ inconsistent DB
+                    print(f"Result: [FAILED] {len(mismatches)} discrepancy(s) in the chain from {start_pin} ({pins_checked} pin(s), {arcs_checked} arc(s) checked)")
                 else:
-                    print(f"Result: [PASSED] {start_pin} chain is consistent.")
+                    print(f"Result: [PASSED] {start_pin} chain is consistent ({pins_checked} pin(s), {arcs_checked} arc(s) checked).")
 
         print("\n" + "="*50)
         print("ALL PATHS CONSISTENT" if overall_trace_success else "STRUCTURAL MISMATCH DETECTED")
         print("="*50)
 
+#fxn to render one histogram straight to an image file with the non-interactive backend; module level so pool workers can pickle it
+def render_spread_png(numeric_values, target_attribute, label, out_path):
+    plt = load_pyplot(headless=True)
+    fig = draw_spread_histogram(numeric_values, target_attribute, label)
+    fig.savefig(out_path, dpi=100)
+    plt.close(fig)
+    return out_path
+
+#fxn to turn a pin/arc name into a safe file name component (bus pins like A[3], hierarchical names etc)
+def safe_filename(name):
+    return re.sub(r'[^\w.-]+', '_', str(name)).strip('_') or "NA"
+
+#fxn to gather the numeric values of an attribute per arc (related_pin, mode) of a pin, across all DBs
+def collect_arc_values(databases, start_pin, target_attribute, arc_pin=None, arc_mode=None):
+    per_arc = {}
+    for arcs in attribute_retrieval(databases, start_pin, target_attribute, arc_pin, arc_mode).values():
+        for arc in arcs or []:
+            if arc["value"] is not None:
+                per_arc.setdefault((arc["related_pin"], arc["mode"]), []).append(arc["value"])
+    return per_arc
+
+#fxn to render spread histograms for many pins without a display: one PNG per pin/arc in out_dir (rendered over
+#`jobs` worker processes), and/or every histogram as one page of a multipage pdf report
+def run_batch_spread(all_dbs, pins, attribute, out_dir=None, pdf_path=None, jobs=1, arc_pin=None, arc_mode=None):
+    plt = load_pyplot(headless=True)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    # data is gathered here; workers only get plain value lists, never the dbs
+    render_jobs = []
+    for pin in pins:
+        for (related_pin, mode), values in collect_arc_values(all_dbs, pin, attribute, arc_pin, arc_mode).items():
+            label = f"Pin: {pin}  Arc: {{{related_pin} | {mode}}}"
+            filename = f"{safe_filename(pin)}__{safe_filename(related_pin)}__{safe_filename(mode)}__{attribute}.png"
+            render_jobs.append((values, label, os.path.join(out_dir, filename) if out_dir else None))
+
+    if not render_jobs:
+        print(f"[!] No valid numerical data found for '{attribute}'.")
+        return
+    print(f"Rendering {len(render_jobs)} histogram(s) for '{attribute}'...")
+
+    if out_dir:
+        if jobs > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = [pool.submit(render_spread_png, values, attribute, label, path) for values, label, path in render_jobs]
+                for idx, future in enumerate(futures, 1):
+                    future.result()
+                    print(f" Progress: [{idx}/{len(futures)}] rendered", end="\r")
+        else:
+            for idx, (values, label, path) in enumerate(render_jobs, 1):
+                render_spread_png(values, attribute, label, path)
+                print(f" Progress: [{idx}/{len(render_jobs)}] rendered", end="\r")
+        print(f"\nHistograms written to: {out_dir}")
+
+    if pdf_path:
+        # a single pdf is written page by page in this process
+        os.makedirs(os.path.dirname(os.path.abspath(pdf_path)), exist_ok=True)
+        from matplotlib.backends.backend_pdf import PdfPages
+        with PdfPages(pdf_path) as pdf:
+            for values, label, _ in render_jobs:
+                fig = draw_spread_histogram(values, attribute, label)
+                pdf.savefig(fig)
+                plt.close(fig)
+        print(f"Histogram report written to: {pdf_path}")
+
 #fxn to actually run the spread analysis, return plots
 def run_spread_analysis(all_dbs, pins, attribute, arc_pin=None, arc_mode=None):
         if not pins or not attribute:
@@ -245,12 +1220,148 @@ def run_spread_analysis(all_dbs, pins, attribute, arc_pin=None, arc_mode=None):
         for p in pins:
             attribute_spread(all_dbs, p, attribute, arc_pin, arc_mode)
 
+#fxn to build a dense (arc x DB) float matrix of one attribute, NaN where the value is N/A or the arc is absent
+#arcs are keyed (pin, related_pin, mode, n) - n numbers repeated (pin, related_pin, mode) arcs within a db
+#returns (arc_keys, matrix) with matrix[i, j] = value of arc_keys[i] in DB j
+def build_attribute_matrix(databases, target_attribute, pins=None):
+    import numpy as np
+    store = consolidated_store(databases)
+    if store is not None:
+        return store.attribute_matrix(target_attribute, pins)
+    row_of = {}
+    arc_keys = []
+    rows, cols, values = [], [], []
+    for db_idx, db in enumerate(databases):
+        for pin in (pins if pins else db.keys()):
+            arcs = db.get(pin)
+            if not arcs:
+                continue
+            seen = Counter()
+            for a in arcs:
+                base_key = (pin, a.get("related_pin", "N/A"), a.get("mode", "N/A"))
+                key = base_key + (seen[base_key],)
+                seen[base_key] += 1
+                row = row_of.get(key)
+                if row is None:
+                    row = row_of[key] = len(arc_keys)
+                    arc_keys.append(key)
+                try:
+                    val = float(a.get(target_attribute, "N/A"))
+                except (ValueError, TypeError):
+                    continue
+                rows.append(row)
+                cols.append(db_idx)
+                values.append(val)
+
+    matrix = np.full((len(arc_keys), len(databases)), np.nan)
+    matrix[rows, cols] = values
+    return arc_keys, matrix
+
+#fxn to compute per-arc statistics over the DB axis of an attribute matrix in one vectorized pass
+#rows with no numeric value at all come out as NaN
+def attribute_statistics(matrix, percentiles=(5, 50, 95)):
+    import numpy as np
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)  # all-NaN rows
+        stats = {
+            "count": np.sum(~np.isnan(matrix), axis=1),
+            "min": np.nanmin(matrix, axis=1),
+            "max": np.nanmax(matrix, axis=1),
+            "mean": np.nanmean(matrix, axis=1),
+            "std": np.nanstd(matrix, axis=1),
+        }
+        stats["spread"] = stats["max"] - stats["min"]
+        if percentiles:
+            for p, column in zip(percentiles, np.nanpercentile(matrix, percentiles, axis=1)):
+                stats[f"p{p:g}"] = column
+    return stats
+
+#fxn to run the chip-wide statistics for one attribute: rank arcs by spread, print the top ones and optionally export all
+def run_attribute_stats(all_dbs, attribute, pins=None, output_path=None, top=20, percentiles=(5, 50, 95)):
+    import numpy as np
+    if not attribute:
+        sys.exit("Error: --stats requires --get_attribute.")
+
+    arc_keys, matrix = build_attribute_matrix(all_dbs, attribute, pins)
+    if not arc_keys:
+        print(f"[!] No arcs found for '{attribute}'.")
+        return
+    stats = attribute_statistics(matrix, percentiles)
+
+    # rank by spread, largest first; arcs without numeric data go last
+    order = np.argsort(np.nan_to_num(-stats["spread"], nan=np.inf), kind="stable")
+    stat_names = list(stats)
+
+    print(f"\n" + "="*60)
+    print(f"SPREAD RANKING: {attribute} ({len(arc_keys)} arcs x {len(all_dbs)} DBs)")
+    print("-" * 60)
+    for rank, i in enumerate(order[:top], 1):
+        pin, rp, mode, _ = arc_keys[i]
+        print(f"{rank:>4}. {pin} {{{rp} | {mode}}}  spread={stats['spread'][i]:.6f}  min={stats['min'][i]:.6f}  max={stats['max'][i]:.6f}  mean={stats['mean'][i]:.6f}")
+    print("="*60 + "\n")
+
+    if output_path:
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        with open(output_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["rank", "pin", "related_pin", "mode", "occurrence"] + stat_names)
+            for rank, i in enumerate(order, 1):
+                writer.writerow([rank, *arc_keys[i]] + [stats[name][i] for name in stat_names])
+        print(f"Ranked statistics written to: {output_path}")
+
+#fxn to print interpolated attribute values, one line per operating point
+def interpolation_print_pretty(data_map, start_pin, target_attribute, points):
+    print(f"\nInterpolated {target_attribute} for Pin: {start_pin}")
+
+    for db_idx, arcs in data_map.items():
+        print(f"\n---- DB Index: {db_idx} ----")
+
+        if arcs is None:
+            print(f"  [!] Pin '{start_pin}' not found in this database.")
+            continue
+
+        for i, arc in enumerate(arcs):
+            print(f"  Arc {i} {{{arc['related_pin']} | {arc['mode']}}}")
+            if arc["value"] is None:
+                print(f"    {target_attribute} : N/A ({arc.get('note', 'no lookup table on this arc - db generated without --tables?')})")
+                continue
+            for (p1, p2), v in zip(points, arc["value"]):
+                print(f"    @ ({p1}, {p2}) : {v:.6f}")
+
+#fxn to parse --at operating points given as "index_1,index_2" strings
+def parse_operating_points(raw_points):
+    points = []
+    for raw in raw_points:
+        try:
+            p1, p2 = (float(v) for v in raw.split(","))
+        except ValueError:
+            sys.exit(f"Error: invalid operating point '{raw}', expected <index_1>,<index_2>")
+        points.append((p1, p2))
+    return points
+
+#fxn to actually run the interpolation for input attribute with --get_attribute and --at arguments
+def run_interpolation(all_dbs, pins, attribute, points, arc_pin=None, arc_mode=None):
+    if not pins or not attribute:
+        sys.exit("Error: --at requires --pins (or --all) and --get_attribute.")
+    pins = list(dict.fromkeys(pins))
+    results = table_interpolation(all_dbs, pins, attribute, points, arc_pin, arc_mode)
+    for pin in pins:
+        interpolation_print_pretty(results[pin], pin, attribute, points)
+
 #fxn to actually retrieve the values for input attribute with --get_attribute argument
 def run_attribute_retrieval(all_dbs, pins, attribute, arc_pin=None, arc_mode=None):
     for pin in pins:
         results = attribute_retrieval(all_dbs, pin, attribute, arc_pin, arc_mode)
         attribute_print_pretty(results, pin, attribute)
 
+#fxn to list the corners of the loaded dbs with their metadata (PVT from the lib header, for a consolidated store)
+def run_corner_listing(all_dbs):
+    print(f"{'DB Index':<10}{'corner':<32}PVT")
+    for idx, db in enumerate(all_dbs):
+        name = getattr(db, "name", None) or os.path.basename(getattr(db, "json_path", "")) or "N/A"
+        pvt = getattr(db, "pvt", None)
+        print(f"{idx:<10}{name:<32}{json.dumps(pvt) if pvt else 'N/A'}")
+
 #helper fxn to return target pins when --all argument used. ---> may need to be modified if 
 def get_target_pins(args, ref_db):
     if args.all:
@@ -258,43 +1369,264 @@ def get_target_pins(args, ref_db):
         return list(ref_db.keys())
     return args.pins or []
 
-def main():
+#fxn to build the cli parser (shared by the normal cli, the query server and its client)
+def build_parser():
     parser = argparse.ArgumentParser(description="Automated Timing Database Comparison Tool")
-    parser.add_argument("folderpath", help="Path to the directory containing JSON database files")
+    parser.add_argument("folderpath", help="Path to the directory containing JSON database files, or to a .sqlite timing db")
     parser.add_argument("--compare", action="store_true", help="Enable structural path tracing")    
     parser.add_argument("--pins", nargs="+", help="The starting pin(s) to begin the DFS traversal")    
     parser.add_argument("--all", action="store_true", help="Process all parent pins from the reference DB")
-    parser.add_argument("--get_attribute", help=" to fetch values across PVTX db for a given attribue type | Valid attributes : [pin, direction, related_pin, mode, setup_rise, setup_fall, hold_rise, hold_fall, comb_setup_rise, comb_setup_fall, comb_hold_rise, comb_hold_fall, seq_clk_arc, seq_setup_rise, seq_setup_fall, seq_hold_rise, seq_hold_fall]")
+    parser.add_argument("--get_attribute", help=" to fetch values across PVTX db for a given attribue type | Valid attributes : [pin, direction, related_pin, mode, setup_rise, setup_fall, hold_rise, hold_fall, comb_setup_rise, comb_setup_fall, comb_hold_rise, comb_hold_fall, seq_clk_arc, seq_setup_rise, seq_setup_fall, seq_hold_rise, seq_hold_fall] - dbs extracted with --ocv also have <attribute>_sigma_early/_late (e.g. setup_rise_sigma_late)")
     parser.add_argument("--spread", action="store_true", help="Flag to trigger spread/histogram analysis")
     parser.add_argument("--arc", nargs="+", help = "Valid input  for this optional argument is the related_pin& mode for key-pin: passes the arc characterised by this key_pin-related_pin pair for attribute_retrieval")
-    args = parser.parse_args()
+    parser.add_argument("--out_dir", help="With --spread: render headless, writing one PNG per pin/arc into this directory instead of opening windows")
+    parser.add_argument("--pdf", help="With --spread: render headless into this multipage pdf report (one page per pin/arc)")
+    parser.add_argument("--render_jobs", type=int, default=1, help="With --spread --out_dir: number of worker processes rendering PNGs (default: 1)")
+    parser.add_argument("--at", nargs="+", help="Operating point(s) as <index_1>,<index_2> (e.g. slew,load) at which to interpolate the --get_attribute lookup table (for --pins, or every pin with --all); needs a db generated with --tables")
+    parser.add_argument("--stats", action="store_true", help="Per-arc min/max/spread/mean/std/percentiles of --get_attribute over all DBs, for all pins (or --pins), ranked by spread")
+    parser.add_argument("--stats_out", help="With --stats: export the full ranked statistics to this csv file")
+    parser.add_argument("--top", type=int, default=20, help="With --stats / --diff: number of top-spread arcs / largest changes to print (default: 20)")
+    parser.add_argument("--percentiles", nargs="+", type=float, default=[5, 50, 95], help="With --stats: percentiles to compute (default: 5 50 95)")
+    parser.add_argument("--diff", metavar="BASELINE", help="Diff the json db folder against this baseline db folder (e.g. the last release): pins with unchanged hashes are skipped, changed arcs are listed with their numeric deltas")
+    parser.add_argument("--report", help="With --compare --all / --diff: write the mismatch / change report to this path (.json, otherwise csv)")
+    parser.add_argument("--load_jobs", type=int, default=1, help="Number of worker processes used to decode json dbs when a full load is needed (e.g. --compare --all)")
+    parser.add_argument("--load_stats", action="store_true", help="Report per-file load times and sizes")
+    parser.add_argument("--corners", action="store_true", help="List the loaded DBs (corners) by index, with their PVT metadata when the db is a consolidated store")
+    parser.add_argument("--serve", metavar="SOCKET", help="Run as a query server on this unix socket: load the dbs once, keep them resident and answer queries from --server clients")
+    parser.add_argument("--server", metavar="SOCKET", help="Send this query to a running --serve server on SOCKET instead of loading the dbs")
+    return parser
+
+#fxn to run one parsed query against already loaded dbs (the body of the cli, also used by the query server)
+def run_query(args, all_dbs):
     #vars for characterising an arc
     arc_pin = args.arc[0] if args.arc else None
     arc_mode = args.arc[1] if args.arc else None
 
-    all_dbs = load_database(args.folderpath)
+    # argument handler
+    if args.diff:
+        run_db_diff(args.folderpath, args.diff, args.report, args.top)
 
-    if not all_dbs:
-        sys.exit("Error: No valid JSON databases found.")
+    elif args.corners:
+        run_corner_listing(all_dbs)
 
-    print(f"Successfully loaded {len(all_dbs)} database(s).")
+    elif args.compare and args.all:
+        run_compare_all(all_dbs, args.report)
 
-    target_pins = get_target_pins(args, all_dbs[0]) #last argument (i.e. for DB) may be chose to represnet a reference DB
-
-    # argument handler
-    if args.compare:
+    elif args.compare:
+        target_pins = get_target_pins(args, all_dbs[0]) #last argument (i.e. for DB) may be chose to represnet a reference DB
         run_comparison(all_dbs, target_pins)
     
+    elif args.stats:
+        run_attribute_stats(all_dbs, args.get_attribute, args.pins, args.stats_out, args.top, args.percentiles)
+
+    elif args.at:
+        pins = args.pins or (list(all_dbs[0].keys()) if args.all else None)
+        run_interpolation(all_dbs, pins, args.get_attribute, parse_operating_points(args.at), arc_pin, arc_mode)
+
+    elif args.spread and (args.out_dir or args.pdf):
+        pins = args.pins or (list(all_dbs[0].keys()) if args.all else None)
+        if not pins or not args.get_attribute:
+            sys.exit("Error: --spread requires --pins (or --all) and --get_attribute.")
+        run_batch_spread(all_dbs, pins, args.get_attribute, args.out_dir, args.pdf, args.render_jobs, arc_pin, arc_mode)
+
     elif args.spread:
         run_spread_analysis(all_dbs, args.pins, args.get_attribute, arc_pin, arc_mode)
        
     
     elif args.pins and args.get_attribute:
         run_attribute_retrieval(all_dbs, args.pins,args.get_attribute, arc_pin,arc_mode)
-  
+
+class ResidentDatabases:
+    """
+    The dbs held in memory by the query server. Json dbs are fully decoded
+    once; before every query the folder is re-stat'ed and only files that
+    were added, removed or changed (size/mtime) are reloaded, so the list
+    stays in the same sorted order as load_database. A sqlite db is served
+    through its lazy views, which see committed updates on their own. A
+    consolidated store is reopened when its structure file changed.
+    """
+    def __init__(self, folderpath, jobs=1):
+        self.folderpath = folderpath
+        self.jobs = jobs
+        self.loaded = {}  # filename -> ((size, mtime), db)
+        self.sqlite_dbs = None
+        self.store_dbs = (None, None)  # (structure mtime, corner views)
+
+    def refresh(self):
+        if is_consolidated_store(self.folderpath):
+            # --consolidate swaps in a whole new store directory, so the old memory maps would be stale
+            mtime = os.stat(os.path.join(self.folderpath, CONSOLIDATED_STRUCTURE)).st_mtime
+            if self.store_dbs[0] != mtime:
+                self.store_dbs = (mtime, load_consolidated_database(self.folderpath))
+                print(f"[server] (re)opened consolidated store {self.folderpath}", file=sys.stderr)
+            return self.store_dbs[1]
+        if os.path.isfile(self.folderpath):
+            if self.sqlite_dbs is None:
+                self.sqlite_dbs = load_database(self.folderpath)
+            return self.sqlite_dbs
+
+        stamps = {}
+        for entry in os.scandir(self.folderpath):
+            if entry.name.endswith(JSON_DB_SUFFIXES):
+                st = entry.stat()
+                stamps[entry.name] = (st.st_size, st.st_mtime)
+
+        for filename in set(self.loaded) - set(stamps):
+            del self.loaded[filename]
+        changed = sorted(f for f, stamp in stamps.items() if f not in self.loaded or self.loaded[f][0] != stamp)
+        if changed:
+            start = time.perf_counter()
+            paths = [os.path.join(self.folderpath, f) for f in changed]
+            if self.jobs > 1 and len(paths) > 1:
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                    results = list(pool.map(load_json_file, paths))
+            else:
+                results = [load_json_file(path) for path in paths]
+            for filename, (db, _, _) in zip(changed, results):
+                self.loaded[filename] = (stamps[filename], db)
+            print(f"[server] (re)loaded {len(changed)} db file(s) in {time.perf_counter() - start:.3f}s", file=sys.stderr)
+        return [self.loaded[f][1] for f in sorted(self.loaded)]
+
+#fxn to read a whole request/response off a socket (the peer shuts down its write side when done)
+def recv_all(sock):
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+#fxn to run the query server: dbs stay resident, each client request is one cli argv answered with its captured output
+def serve(args):
+    import io
+    import contextlib
+    import signal
+    import socket
+
+    # treat SIGTERM like Ctrl-C so the socket file gets cleaned up either way
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, stop)
+
+    # the server never opens windows; spread plots must go to --out_dir/--pdf
+    plt = load_pyplot(headless=True)
+    # queries run in the client's cwd, so everything the server itself keeps using is made absolute up front
+    server_cwd = os.getcwd()
+    folderpath = os.path.abspath(args.folderpath)
+    socket_path = os.path.abspath(args.serve)
+    dbs = ResidentDatabases(folderpath, args.load_jobs)
+    print(f"[server] loaded {len(dbs.refresh())} database(s) from {args.folderpath}", file=sys.stderr)
+
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen()
+    print(f"[server] listening on {socket_path}", file=sys.stderr)
+
+    #fxn to answer one request; returns (output, exit code)
+    def answer(request):
+        output = io.StringIO()
+        exit_code = 0
+        try:
+            with contextlib.redirect_stdout(output):
+                query = build_parser().parse_args(request["argv"])
+                # the client's relative paths (folderpath, --diff, --out_dir, --stats_out, ...) are relative to its cwd
+                os.chdir(request["cwd"])
+                if os.path.abspath(query.folderpath) != folderpath:
+                    sys.exit(f"Error: this server serves {folderpath}, not {os.path.abspath(query.folderpath)}")
+                query.folderpath = folderpath
+                run_query(query, dbs.refresh())
+        except SystemExit as e:
+            if isinstance(e.code, str):
+                output.write(e.code + "\n")
+                exit_code = 1
+            else:
+                exit_code = e.code or 0
+        except Exception as e:
+            output.write(f"Error: query failed: {e!r}\n")
+            exit_code = 1
+        finally:
+            os.chdir(server_cwd)
+            plt.close('all')
+        return output.getvalue(), exit_code
+
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                # a malformed request or a client that hangs up only costs that connection, never the server
+                try:
+                    request = json.loads(recv_all(conn))
+                except (OSError, ValueError) as e:
+                    print(f"[server] dropped unreadable request: {e}", file=sys.stderr)
+                    continue
+                output, exit_code = answer(request)
+                try:
+                    conn.sendall(json.dumps({"output": output, "exit_code": exit_code}).encode())
+                except OSError as e:
+                    print(f"[server] client went away before the reply: {e}", file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        os.remove(socket_path)
+
+#fxn to send this cli invocation to a running query server and print its answer
+def query_server(socket_path, argv):
+    import socket
+
+    # drop the --server option itself (--server SOCKET or --server=SOCKET); everything else is the query
+    query_argv = []
+    args_iter = iter(argv)
+    for arg in args_iter:
+        if arg == "--server":
+            next(args_iter, None)
+        elif not arg.startswith("--server="):
+            query_argv.append(arg)
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except OSError as e:
+        sys.exit(f"Error: cannot reach query server at {socket_path}: {e}")
+    with client:
+        client.sendall(json.dumps({"argv": query_argv, "cwd": os.getcwd()}).encode())
+        client.shutdown(socket.SHUT_WR)
+        response = json.loads(recv_all(client))
+    sys.stdout.write(response["output"])
+    sys.exit(response["exit_code"])
+
+def main():
+    args = build_parser().parse_args()
+
+    if args.server:
+        query_server(args.server, sys.argv[1:])
+
+    if args.serve:
+        serve(args)
+        return
+
+    # the diff works from the hash sidecars of both folders and decodes only changed pins itself
+    if args.diff:
+        run_db_diff(args.folderpath, args.diff, args.report, args.top)
+        return
+
+    # full-db passes (bulk compare, chip-wide stats) load every db up front; everything else loads pins on demand
+    full_load = (args.compare and args.all) or (args.stats and not args.pins)
+    # both only read the arc structure (plus the one --stats attribute), so parallel loads ship back just that
+    fields = ("related_pin", "mode", args.get_attribute) if args.stats else ("related_pin", "mode")
+    all_dbs = load_database(args.folderpath, lazy=not full_load, jobs=args.load_jobs, report=args.load_stats, fields=fields)
+
+    if not all_dbs:
+        sys.exit("Error: No valid JSON databases found.")
+
+    print(f"Successfully loaded {len(all_dbs)} database(s).")
+
+    run_query(args, all_dbs)
     
     
 if __name__ == "__main__":
     main()
-
-    
@@ -0,0 +1,57 @@
+import argparse
+import importlib.util
+import os
+import subprocess
+import time
+
+#load ip-db-gen-script.py as a module (hyphenated filename, so a plain import does not work)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_spec = importlib.util.spec_from_file_location("ip_db_gen", os.path.join(SCRIPT_DIR, "ip-db-gen-script.py"))
+ip_db_gen = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(ip_db_gen)
+
+#fxn to read a lib the way parse_lib used to: zcat subprocess, line buffered, text decoded
+def read_zcat_lines(input_file):
+    proc = subprocess.Popen(['zcat', input_file], stdout=subprocess.PIPE, text=True, bufsize=1)
+    for line in proc.stdout:
+        yield line
+    proc.wait()
+
+#fxn to time one full pass of a reader over a file; returns elapsed seconds
+def time_reader(reader, input_file):
+    start = time.perf_counter()
+    for _ in reader(input_file):
+        pass
+    return time.perf_counter() - start
+
+#fxn to get the decompressed size of a lib file in bytes
+def decompressed_size(input_file):
+    with ip_db_gen.open_lib_stream(input_file) as stream:
+        return sum(len(chunk) for chunk in iter(lambda: stream.read(ip_db_gen.READ_CHUNK_SIZE), b""))
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput comparison: zcat subprocess vs in-process chunked decompression")
+    parser.add_argument("filepath", help="File containing list of directory paths to scan")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per reader; best run is reported")
+    args = parser.parse_args()
+
+    f_list = ip_db_gen.create_file_list(ip_db_gen.read_directory_list_file(args.filepath))
+    # zcat only understands gzip, so restrict the comparison to .lib.gz inputs
+    f_list = [f for f in f_list if f.endswith(".lib.gz")]
+    if not f_list:
+        print("No .lib.gz files found.")
+        return
+
+    readers = [("zcat subprocess", read_zcat_lines), ("in-process chunked", ip_db_gen.read_lib_lines)]
+    print(f"gzip backend: {ip_db_gen.gzip_backend.__name__}")
+    print(f"{'reader':<22}{'files':>8}{'MB':>12}{'seconds':>12}{'MB/s':>12}")
+
+    mb = sum(decompressed_size(f) for f in f_list) / 1e6
+    for name, reader in readers:
+        total_time = 0.0
+        for input_file in f_list:
+            total_time += min(time_reader(reader, input_file) for _ in range(max(args.repeat, 1)))
+        print(f"{name:<22}{len(f_list):>8}{mb:>12.2f}{total_time:>12.3f}{mb / total_time if total_time else 0:>12.1f}")
+
+if __name__ == "__main__":
+    main()
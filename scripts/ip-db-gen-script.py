@@ -1,14 +1,52 @@
 import argparse
-import subprocess
 import re
 import csv
 import sys
 import os
 import json
+import gzip
+import bz2
+import lzma
+import base64
+import hashlib
+import sqlite3
+import fnmatch
+import time
+import resource
+import queue
+import threading
+import contextlib
+import shutil
+import numpy as np
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 TEST_DIR = "../extracted_data/test-data"
 CSV_DIR = "../extracted_data/csv-logs/test-data"
 DB_DIR = "../extracted_data/db-dir/test-data"
+#records what was extracted from which lib (size/mtime/hash -> outputs), used to skip unchanged libs on re-runs
+MANIFEST_PATH = "../extracted_data/extraction-manifest.json"
+#single-file indexed alternative to the per-lib json dbs (all libs in one sqlite file)
+SQLITE_DB_PATH = "../extracted_data/db-dir/test-data.sqlite"
+#consolidated multi-corner store (--consolidate): every corner's json db merged into one directory of per-attribute arrays
+CONSOLIDATED_DB_PATH = "../extracted_data/db-dir/test-data.corners"
+#directory listings from the last crawl (dir -> mtime, lib files, subdirs), so unchanged directories are not re-listed
+CRAWL_CACHE_PATH = "../extracted_data/crawl-cache.json"
+
+#lib file suffixes picked up by the crawler - order matters, longest suffix first
+LIB_SUFFIXES = (".lib.gz", ".lib.bz2", ".lib.xz", ".lib")
+#size of the raw chunks pulled from the (de)compressor per read
+READ_CHUNK_SIZE = 4 * 1024 * 1024
+#pipelined mode (--pipeline): items in flight between two stages (decompressed chunks / row batches) - caps the memory it adds
+PIPELINE_QUEUE_DEPTH = 4
+#rows per batch handed from the parse stage to the write stage
+PIPELINE_BATCH_ROWS = 256
+
+# optional faster gzip backend (python-isal); falls back to the stdlib gzip module
+try:
+    from isal import igzip as gzip_backend
+except ImportError:
+    gzip_backend = gzip
 
 def read_directory_list_file(directory_list_file):
     # reads a file containing a list of directory paths.
@@ -22,200 +60,739 @@ def read_directory_list_file(directory_list_file):
                 for line in f if line.strip()]
     
 
+class DirectoryCrawler:
+    """Finds lib files under the listed directories, listing directories concurrently.
+
+    include/exclude are shell-style globs matched against an entry's name and its path relative to the
+    listed directory; excluded directories are not descended into. max_depth limits how far below a
+    listed directory the crawl goes (0: only its own files). With a cache_path, each directory's listing
+    is cached with its mtime, and a directory whose mtime is unchanged is not listed again.
+    """
+    #listings of directories modified less than this many seconds before the scan are not cached
+    #(an entry added within the same mtime tick would otherwise go unnoticed)
+    MTIME_SETTLE = 2.0
+
+    def __init__(self, include=None, exclude=None, max_depth=None, jobs=8, cache_path=None, rescan=False):
+        self.include = include or []
+        self.exclude = exclude or []
+        self.max_depth = max_depth
+        self.jobs = max(jobs, 1)
+        self.cache_path = cache_path
+        self.cache = {} if rescan or not cache_path else self.load_cache(cache_path)
+        self.new_cache = {}
+        self.error = None
+        self.listed = 0
+        self.cached = 0
+
+    @staticmethod
+    def load_cache(cache_path):
+        if not os.path.exists(cache_path):
+            return {}
+        try:
+            with open(cache_path, 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: ignoring unreadable crawl cache '{cache_path}': {e}")
+            return {}
+
+    def save_cache(self):
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.new_cache, f, separators=(",", ":"))
+        os.replace(tmp_path, self.cache_path)
+
+    @staticmethod
+    def _match(patterns, name, rel_path):
+        return any(fnmatch.fnmatchcase(name, p) or fnmatch.fnmatchcase(rel_path, p) for p in patterns)
+
+    #fxn to list one directory; returns (lib file names, subdirectory names) - from the cache when its mtime is unchanged
+    def list_dir(self, path):
+        mtime = None
+        if self.cache_path:
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError as e:
+                print(f"Skipping: {path} ({e.strerror})")
+                return [], []
+        cached = self.cache.get(path)
+        if cached and cached["mtime"] == mtime:
+            self.new_cache[path] = cached
+            self.cached += 1
+            return cached["libs"], cached["dirs"]
+
+        libs, dirs = [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    # like os.walk: symlinked directories are not followed
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.name)
+                    elif entry.name.endswith(LIB_SUFFIXES):
+                        libs.append(entry.name)
+        except OSError as e:
+            print(f"Skipping: {path} ({e.strerror})")
+            return [], []
+        self.listed += 1
+        if mtime is not None and time.time() - mtime > self.MTIME_SETTLE:
+            self.new_cache[path] = {"mtime": mtime, "libs": libs, "dirs": dirs}
+        return libs, dirs
+
+    #fxn to crawl the directory tree, putting the matching lib paths of each directory on found as soon as it is listed
+    #None is put last, also when the crawl fails
+    def _crawl_into(self, roots, found):
+        try:
+            seen = set(roots)
+            done = queue.Queue()
+            with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+                # future -> (directory, its path relative to the listed directory, depth)
+                pending = {}
+
+                def submit(path, rel_dir, depth):
+                    future = pool.submit(self.list_dir, path)
+                    pending[future] = (path, rel_dir, depth)
+                    future.add_done_callback(done.put)
+
+                for root in roots:
+                    submit(root, "", 0)
+                while pending:
+                    future = done.get()
+                    path, rel_dir, depth = pending.pop(future)
+                    libs, dirs = future.result()
+                    # plain concatenation instead of os.path.join - this loop runs once per entry of the whole tree
+                    prefix, rel_prefix = os.path.join(path, ""), os.path.join(rel_dir, "") if rel_dir else ""
+                    if self.include or self.exclude:
+                        libs = [name for name in libs
+                                if (not self.include or self._match(self.include, name, rel_prefix + name))
+                                and not self._match(self.exclude, name, rel_prefix + name)]
+                    if libs:
+                        found.put([prefix + name for name in libs])
+                    if self.max_depth is not None and depth >= self.max_depth:
+                        continue
+                    for name in dirs:
+                        sub_path = prefix + name
+                        if sub_path in seen or (self.exclude and self._match(self.exclude, name, rel_prefix + name)):
+                            continue
+                        seen.add(sub_path)
+                        submit(sub_path, rel_prefix + name, depth + 1)
+        except Exception as e:
+            self.error = e
+        finally:
+            found.put(None)
+
+    #fxn to yield the lib files under directory_list while the crawl is still running (it runs on a background thread)
+    #the cache is saved once the crawl has completed
+    def crawl(self, directory_list):
+        roots = []
+        for path in directory_list:
+            if not os.path.isdir(path):
+                print(f"Skipping: {path} (Not a directory)")
+                continue
+            roots.append(os.path.normpath(path))
+        found = queue.Queue()
+        crawler = threading.Thread(target=self._crawl_into, args=(roots, found), daemon=True)
+        crawler.start()
+        while True:
+            paths = found.get()
+            if paths is None:
+                break
+            yield from paths
+        crawler.join()
+        if self.error:
+            raise self.error
+        self.save_cache()
+
 #fxn to walk through directries in input arg directory list, fetch candidate files, create a list of such files to be passed to actual parse worker fxn
-def create_file_list(directory_list): 
+def create_file_list(directory_list, crawler=None):
 
     # directory_list is just list of directories, returned by read_directory_list_file fxn
-    file_list =  []
-    for path in directory_list:
-        if not os.path.isdir(path):
-            print(f"Skipping: {path} (Not a directory)")
-            continue
-        for root, _, files in os.walk(path):
-            for f in files:
-                if f.endswith(".lib.gz"):
-                    file_list.append(os.path.join(root, f))    
-    return file_list 
+    return list((crawler or DirectoryCrawler()).crawl(directory_list))
+
+#fxn to strip the lib suffix (.lib.gz, .lib.bz2, .lib.xz, .lib) from a filename - used to name output logs/dbs
+def lib_stem(filename):
+    for suffix in LIB_SUFFIXES:
+        if filename.endswith(suffix):
+            return filename[:-len(suffix)]
+    return filename
+
+#fxn to open a lib file as a binary stream, decompressing in-process based on its suffix
+def open_lib_stream(input_file):
+    if input_file.endswith(".gz"):
+        return gzip_backend.open(input_file, 'rb')
+    if input_file.endswith(".bz2"):
+        return bz2.open(input_file, 'rb')
+    if input_file.endswith(".xz"):
+        return lzma.open(input_file, 'rb')
+    return open(input_file, 'rb')
+
+class ChunkPrefetcher:
+    """
+    Decompress stage of the pipelined mode: reads a lib stream chunk by chunk
+    on its own thread into a bounded queue, so decompression (which releases
+    the GIL) overlaps with lexing/parsing. read() hands out the next chunk.
+    """
+    def __init__(self, stream, chunk_size=READ_CHUNK_SIZE, depth=PIPELINE_QUEUE_DEPTH, metrics=None):
+        self.queue = queue.Queue(maxsize=depth)
+        self.metrics = metrics
+        self.stopped = threading.Event()
+        self.eof = False
+        self.thread = threading.Thread(target=self._run, args=(stream, chunk_size), daemon=True)
+        self.thread.start()
+
+    def _run(self, stream, chunk_size):
+        try:
+            while not self.stopped.is_set():
+                start = time.perf_counter()
+                chunk = stream.read(chunk_size)
+                if self.metrics is not None:
+                    self.metrics.add("decompress", time.perf_counter() - start)
+                    self.metrics.bytes_decompressed += len(chunk)
+                self._put(chunk)
+                if not chunk:
+                    return
+        except Exception as e:
+            self._put(e)
+
+    #blocks while the queue is full (backpressure), gives up once the reader side was closed
+    def _put(self, item):
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def read(self, size=-1):
+        if self.eof:
+            return b""
+        start = time.perf_counter()
+        item = self.queue.get()
+        if self.metrics is not None:
+            self.metrics.wait += time.perf_counter() - start
+        if isinstance(item, Exception):
+            raise item
+        self.eof = not item
+        return item
+
+    def close(self):
+        self.stopped.set()
+        self.thread.join()
+
+#fxn to open a lib file for chunked reading - with pipelined, chunks are decompressed ahead on a ChunkPrefetcher thread
+@contextlib.contextmanager
+def open_chunk_reader(input_file, chunk_size=READ_CHUNK_SIZE, pipelined=False, metrics=None):
+    with open_lib_stream(input_file) as stream:
+        if not pipelined:
+            yield stream
+            return
+        reader = ChunkPrefetcher(stream, chunk_size, metrics=metrics)
+        try:
+            yield reader
+        finally:
+            # stop the decompress thread before its stream is closed
+            reader.close()
+
+#fxn to read a lib file in large binary chunks and yield its lines as bytes (no text decoding, no subprocess)
+def read_lib_lines(input_file, chunk_size=READ_CHUNK_SIZE):
+    with open_lib_stream(input_file) as stream:
+        remainder = b""
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            lines = (remainder + chunk).split(b"\n")
+            # last piece may be a partial line - carry it over to the next chunk
+            remainder = lines.pop()
+            yield from lines
+        if remainder:
+            yield remainder
   
+#translation table used to blank out the quotes, commas and line continuations inside a values(...) payload
+VALUES_DELIMITERS = bytes.maketrans(b'\\",', b'   ')
+
 def extract_values(raw_str):
     if not raw_str or raw_str == "N/A": return "N/A"
-    clean = raw_str.replace('\\', ' ').replace('"', ' ').replace('\n', ' ')
-    tokens = [t.strip() for t in re.split(r'[\s,]+', clean) if t.strip()]
+    if isinstance(raw_str, str): raw_str = raw_str.encode()
+    tokens = raw_str.translate(VALUES_DELIMITERS).split()
     num_tokens = len(tokens)
     if num_tokens > 27:
-        return tokens[27]  
+        return tokens[27].decode()
     elif num_tokens > 3:
-        return tokens[3]   
+        return tokens[3].decode()
     '''else :
         return tokens [0]'''
     return "N/A"
 
+#fxn to parse a values()/index_N() payload into a float array with numpy's text parser (no per-token python work)
+def parse_table_array(raw_bytes):
+    return np.fromstring(raw_bytes.translate(VALUES_DELIMITERS).decode('ascii', 'replace'), dtype=np.float64, sep=' ')
+
+#fxn to pack a float array into a compact base64 string of little-endian float32 values
+def encode_array(arr):
+    return base64.b64encode(np.asarray(arr, dtype='<f4').tobytes()).decode('ascii')
+
+#fxn to build the compact db form of a full lookup table: axes + values, each base64 packed, values flattened row-major
+def build_table_entry(table_index, values):
+    index_1 = table_index.get("index_1")
+    index_2 = table_index.get("index_2")
+    if index_1 is not None and index_2 is not None and len(index_1) * len(index_2) == len(values):
+        shape = [len(index_1), len(index_2)]
+    elif index_1 is not None and len(index_1) == len(values):
+        shape = [len(index_1)]
+    else:
+        shape = [len(values)]
+    entry = {"shape": shape, "values": encode_array(values)}
+    if index_1 is not None: entry["index_1"] = encode_array(index_1)
+    if index_2 is not None: entry["index_2"] = encode_array(index_2)
+    return entry
+
+# Liberty statement kinds yielded by iter_lib_statements
+GROUP_OPEN, GROUP_CLOSE, SIMPLE_ATTR, COMPLEX_ATTR = range(4)
+# sent into iter_lib_statements to skip the rest of the current group, and the event it acknowledges that with
+SKIP_GROUP = "skip_group"
+SKIPPED = (None, None, None)
+
+# one pattern that matches a whole Liberty statement: group open/close, simple attribute (name : value;)
+# or complex attribute (name (args);). comments are skipped, anything unrecognised is consumed one byte at a time
+re_statement = re.compile(rb"""
+    [\s\\]*
+    (?:
+        (?P<close>\})
+      | /\*.*?\*/
+      | (?P<name>[A-Za-z_][\w.\[\]]*)[ \t\\]*
+        (?:
+            :[ \t]*(?P<value>"[^"]*"|[^;\n]*);?
+          | \((?P<args>[^)]*)\)[\s\\]*(?P<open>\{)?;?
+        )
+      | [^\s\\]
+    )""", re.S | re.X)
+
+#fxn to lex the statements in buf[pos:limit] into (kind, name, payload) events; returns (offset lexing stopped at, skip)
+#(everything before the offset is consumed, the rest has to wait for the next chunk)
+#sending SKIP_GROUP in reply to an event stops lexing with skip=True, so the caller can skip that group's body
+def lex_statements(buf, pos, limit, eof):
+    match = re_statement.match
+    while pos < limit:
+        m = match(buf, pos)
+        if m is None or (m.end() > limit and not eof):
+            break
+        pos = m.end()
+        name, value, args, is_open = m.group('name', 'value', 'args', 'open')
+        if name is None:
+            if m.group('close'):
+                if (yield GROUP_CLOSE, None, None) == SKIP_GROUP:
+                    return pos, True
+        elif value is not None:
+            if (yield SIMPLE_ATTR, name, value.strip().strip(b'"')) == SKIP_GROUP:
+                return pos, True
+        elif is_open:
+            if (yield GROUP_OPEN, name, args) == SKIP_GROUP:
+                return pos, True
+        else:
+            if (yield COMPLEX_ATTR, name, args) == SKIP_GROUP:
+                return pos, True
+    return pos, False
+
+#fxn to lex a whole buffer up front - used with metrics, so lexing is timed apart from whoever consumes the events
+def collect_statements(buf, limit, eof):
+    lexer = lex_statements(buf, 0, limit, eof)
+    events = []
+    while True:
+        try:
+            events.append(next(lexer))
+        except StopIteration as stop:
+            return events, stop.value[0]
+
+#fxn to skip raw bytes up to the close of the group we are `depth` levels inside - braces are counted, nothing is lexed
+#returns (offset after the closing brace, 0), or (len(buf), remaining depth) when the group goes on in the next chunk
+#(braces inside comments or strings are counted too - liberty files do not put any there in practice)
+def skip_group(buf, pos, depth):
+    while depth:
+        close = buf.find(b'}', pos)
+        if close < 0:
+            return len(buf), depth + buf.count(b'{', pos)
+        depth += buf.count(b'{', pos, close) - 1
+        pos = close + 1
+    return pos, 0
+
+#fxn to lex a lib file into (kind, name, payload) statement events in a single pass over the decompressed chunks
+#payload is the attribute value for SIMPLE_ATTR and the raw argument bytes for GROUP_OPEN/COMPLEX_ATTR
+#the consumer may send SKIP_GROUP in reply to any event to drop the rest of the innermost open group (its close included);
+#send() then returns the SKIPPED ack and iteration carries on after the group
+#with metrics (an ExtractionMetrics), decompression and lexing time plus decompressed bytes are recorded
+#with pipelined, chunks are decompressed ahead on their own thread (see ChunkPrefetcher)
+def iter_lib_statements(input_file, chunk_size=READ_CHUNK_SIZE, metrics=None, pipelined=False):
+    with open_chunk_reader(input_file, chunk_size, pipelined, metrics) as stream:
+        buf = b""
+        eof = False
+        # depth of a skipped group still open at the end of the last chunk (raw bytes), or of one being skipped event by event (metrics)
+        skip_depth = 0
+        while not eof:
+            if metrics is None or pipelined:
+                # the prefetcher books decompress time itself (on its thread) and the time spent waiting for it as wait
+                chunk = stream.read(chunk_size)
+            else:
+                start = time.perf_counter()
+                chunk = stream.read(chunk_size)
+                metrics.add("decompress", time.perf_counter() - start)
+                metrics.bytes_decompressed += len(chunk)
+            eof = not chunk
+            buf += chunk
+            if metrics is None and skip_depth:
+                pos, skip_depth = skip_group(buf, 0, skip_depth)
+                buf = buf[pos:]
+                if skip_depth:
+                    continue
+            if eof:
+                limit = len(buf)
+            else:
+                # only lex up to the last statement terminator - anything after it may continue in the next chunk
+                limit = max(buf.rfind(b';'), buf.rfind(b'{'), buf.rfind(b'}')) + 1
+                comment_open = buf.rfind(b'/*', 0, limit)
+                if comment_open > buf.rfind(b'*/', 0, limit):
+                    limit = comment_open
+            if metrics is None:
+                pos = 0
+                while True:
+                    pos, skip = yield from lex_statements(buf, pos, limit, eof)
+                    if not skip:
+                        break
+                    pos, skip_depth = skip_group(buf, pos, 1)
+                    yield SKIPPED
+                    if skip_depth:
+                        break
+            else:
+                start = time.perf_counter()
+                events, pos = collect_statements(buf, limit, eof)
+                metrics.add("lex", time.perf_counter() - start)
+                # already lexed, so skipped groups are just dropped event by event
+                for event in events:
+                    if skip_depth:
+                        if event[0] == GROUP_OPEN:
+                            skip_depth += 1
+                        elif event[0] == GROUP_CLOSE:
+                            skip_depth -= 1
+                        continue
+                    if (yield event) == SKIP_GROUP:
+                        skip_depth = 1
+                        yield SKIPPED
+            buf = buf[pos:]
+
+#groups nothing is extracted from outside timing() groups - skipped unlexed (inside timing() every non-table group is)
+SKIPPED_GROUPS = {
+    b"internal_power", b"leakage_power", b"power_lut_template", b"output_current_template",
+    b"normalized_driver_waveform", b"receiver_capacitance", b"ccsn_first_stage", b"ccsn_last_stage",
+    b"dynamic_current", b"leakage_current", b"intrinsic_parasitic",
+}
+
+#library-level table templates: their index_1/index_2 are the axes of every table that names them and has no inline axes
+#(read only with keep_tables, skipped like SKIPPED_GROUPS otherwise)
+TABLE_TEMPLATE_GROUPS = {b"lu_table_template", b"ocv_table_template"}
+
+class LibFilter:
+    """
+    Cell/pin/timing_type selection pushed down into parse_lib (--cells,
+    --pins, --timing_types). Patterns are shell-style globs; cell and pin
+    groups that do not match are skipped without being lexed, and timing
+    groups as soon as their timing_type is known. When the cell patterns
+    (or, without --cells, the pin patterns) are all plain names, parsing
+    stops once every one of them has been read.
+    """
+    def __init__(self, cells=None, pins=None, timing_types=None):
+        self.cells = cells or None
+        self.pins = pins or None
+        self.timing_types = timing_types or None
+
+    def __bool__(self):
+        return bool(self.cells or self.pins or self.timing_types)
+
+    @staticmethod
+    def _match(patterns, name):
+        return patterns is None or any(fnmatch.fnmatchcase(name, p) for p in patterns)
+
+    def match_cell(self, name):
+        return self._match(self.cells, name)
+
+    def match_pin(self, name):
+        return self._match(self.pins, name)
+
+    def match_timing_type(self, name):
+        return self._match(self.timing_types, name)
+
+    #fxn to get the groups parsing can stop after: {b"cell": cell names, b"pin": (cell, pin) pairs or None},
+    #or None when no exact cells are named - the same pin name may turn up again in any later cell, so pins
+    #alone never end parsing early
+    @staticmethod
+    def _exact(patterns):
+        return bool(patterns) and not any(c in p for p in patterns for c in "*?[")
+
+    def targets(self):
+        if not self._exact(self.cells):
+            return None
+        pins = {(cell, pin) for cell in self.cells for pin in self.pins} if self._exact(self.pins) else None
+        return {b"cell": set(self.cells), b"pin": pins}
+
+    #fxn to describe the selection for the extraction manifest (None for a full extraction)
+    def describe(self):
+        if not self:
+            return None
+        return {"cells": self.cells, "pins": self.pins, "timing_types": self.timing_types}
+
 #fxn to parse input lib file and yiedls a row_buffer ( a dictionary); with all the fields of interest as keys
-def parse_lib(input_file):
-    
-    # Regex Patterns for required fields that need to be extracted from .lib
-    re_pin = re.compile(r'pin\s*\(\s*"?([^"\)\s]+)"?\s*\)\s*\{', re.IGNORECASE)
-    re_direction = re.compile(r'direction\s*:\s*([^;\s]+)\s*;', re.IGNORECASE)
-    re_timing_open = re.compile(r'timing\s*\(\s*\)\s*\{', re.IGNORECASE)
-    re_type = re.compile(r'timing_type\s*:\s*([^;\s]+)\s*;', re.IGNORECASE)
-    re_related = re.compile(r'related_pin\s*:\s*"?([^";\s]+)"?\s*;', re.IGNORECASE)
-    re_mode = re.compile(r'mode\s*\(.*?,\s*"([^"]+)"\)', re.IGNORECASE)
-    re_sigma_type = re.compile(r'sigma_type\s*:\s*"?([^";\s]+)"?\s*;', re.IGNORECASE)
-    re_min_flag = re.compile(r'min_delay_flag\s*:\s*([^;\s]+)\s*;', re.IGNORECASE)
+#with keep_tables, row_buffer also carries a "tables" dict: column -> full lookup table (see build_table_entry)
+#with metrics, table tokenizing time is recorded on top of what iter_lib_statements records
+#lib_filter (a LibFilter) restricts the cells/pins/timing types parsed; with cell_keys, pin and related_pin
+#are qualified as <cell>/<pin> so same-named pins of different cells stay apart
+#with ocv, row_buffer also carries the ocv sigma early/late value of every column (see OCV_COLUMNS)
+def parse_lib(input_file, keep_tables=False, metrics=None, lib_filter=None, cell_keys=False, ocv=False, pipelined=False):
 
     req_types = ["setup_rising", "setup_falling", "hold_rising", "hold_falling", "combinational", "rising_edge", "falling_edge"]
     base_tables = ["cell_rise", "cell_fall", "rise_constraint", "fall_constraint"]
     ocv_tables = ["ocv_sigma_cell_rise", "ocv_sigma_cell_fall", "ocv_sigma_rise_constraint", "ocv_sigma_fall_constraint"]
     acc_keys = base_tables + [f"{t}_early" for t in ocv_tables] + [f"{t}_late" for t in ocv_tables]
 
-    cmd = ['zcat', input_file]
-    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True, bufsize=1)
+    # table group names as they appear in the raw bytes
+    base_table_names = {t.encode(): t for t in base_tables}
+    ocv_table_names = {t.encode(): t for t in ocv_tables}
 
+    current_cell = "N/A"
     current_pin = "N/A"
     current_direction = "N/A"
     row_buffer = {}
     in_timing = False
     bracket_depth = 0
     accumulator = {}
-    capturing_values = False
-    value_buffer = ""
     active_table_key = None
     pending_base_name = None
+    table_index = {}
+    tables = {}
+    # table template name -> its axes ({"index_1": array, "index_2": array}), and the template being read
+    templates = {}
+    template_name = None
+    table_template = None
+    # (group, name) of the cell/pin/... groups around the current statement, outside timing() groups
+    scope = []
+    targets = lib_filter.targets() if lib_filter else None
 
-    for line in proc.stdout:
-        raw_line = line.strip()
-        if not raw_line: continue
+    statements = iter_lib_statements(input_file, metrics=metrics, pipelined=pipelined)
+    for kind, name, payload in statements:
 
         if not in_timing:
-            pin_match = re_pin.search(raw_line)
-            if pin_match: 
-                current_pin = pin_match.group(1)
-            
-            dir_match = re_direction.search(raw_line)
-            if dir_match:
-                current_direction = dir_match.group(1).strip()
-
-            if re_timing_open.search(raw_line):
-                in_timing = True
-                bracket_depth = 1
-                accumulator = {k: "N/A" for k in acc_keys + ["related_pin", "mode", "timing_type", "min_delay_flag"]}
+            if kind == GROUP_OPEN:
+                if name == b"timing":
+                    in_timing = True
+                    bracket_depth = 1
+                    accumulator = {k: "N/A" for k in acc_keys + ["related_pin", "mode", "timing_type", "min_delay_flag"]}
+                    tables = {}
+                    continue
+                if name in SKIPPED_GROUPS or (name in TABLE_TEMPLATE_GROUPS and not keep_tables):
+                    statements.send(SKIP_GROUP)
+                    continue
+                group_name = None
+                if name in TABLE_TEMPLATE_GROUPS:
+                    template_name = group_name = payload.strip().strip(b'"').decode()
+                    templates[template_name] = {}
+                elif name == b"cell":
+                    current_cell = group_name = payload.strip().strip(b'"').decode()
+                    if lib_filter and not lib_filter.match_cell(current_cell):
+                        statements.send(SKIP_GROUP)
+                        continue
+                elif name == b"pin":
+                    current_pin = group_name = payload.strip().strip(b'"').decode()
+                    if lib_filter and not lib_filter.match_pin(current_pin):
+                        statements.send(SKIP_GROUP)
+                        continue
+                scope.append((name, group_name))
+            elif kind == GROUP_CLOSE and scope:
+                group, group_name = scope.pop()
+                if group in TABLE_TEMPLATE_GROUPS:
+                    template_name = None
+                # early exit: every requested cell (or pin of the requested cells) has been read in full
+                if targets and targets.get(group) is not None:
+                    targets[group].discard((current_cell, group_name) if group == b"pin" else group_name)
+                    if not targets[group]:
+                        break
+            elif kind == SIMPLE_ATTR and name == b"direction":
+                current_direction = payload.decode()
+            elif kind == COMPLEX_ATTR and template_name is not None and (name == b"index_1" or name == b"index_2"):
+                templates[template_name][name.decode()] = parse_table_array(payload)
             continue
 
-        bracket_depth += raw_line.count('{')
-        bracket_depth -= raw_line.count('}')
-
         # capture timing_type, realted_pin, mode etc - that occur right after timing() block starts
-        if "timing_type" in raw_line:
-            tm = re_type.search(raw_line)
-            if tm: accumulator["timing_type"] = tm.group(1).strip()
-        if "related_pin" in raw_line:
-            rm = re_related.search(raw_line)
-            if rm: accumulator["related_pin"] = rm.group(1)
-        if "mode" in raw_line:
-            mm = re_mode.search(raw_line)
-            if mm: accumulator["mode"] = mm.group(1).strip()
-        if "min_delay_flag" in raw_line:
-            mf = re_min_flag.search(raw_line)
-            if mf: accumulator["min_delay_flag"] = mf.group(1).strip().lower()
+        if kind == SIMPLE_ATTR:
+            if name == b"timing_type":
+                accumulator["timing_type"] = payload.decode()
+                # arcs of other timing types are never written - drop the rest of the group unparsed
+                if bracket_depth == 1 and (not any(x in accumulator["timing_type"] for x in req_types)
+                                           or (lib_filter and not lib_filter.match_timing_type(accumulator["timing_type"]))):
+                    statements.send(SKIP_GROUP)
+                    in_timing = False
+                    active_table_key, pending_base_name = None, None
+            elif name == b"related_pin":
+                accumulator["related_pin"] = payload.split()[0].decode() if payload else "N/A"
+            elif name == b"min_delay_flag":
+                accumulator["min_delay_flag"] = payload.lower().decode()
+            elif name == b"sigma_type" and pending_base_name:
+                active_table_key = f"{pending_base_name}_{payload.decode()}"
+            continue
+
+        if kind == COMPLEX_ATTR:
+            if name == b"values":
+                if active_table_key:
+                    if metrics is not None: start = time.perf_counter()
+                    accumulator[active_table_key] = extract_values(payload)
+                    if keep_tables:
+                        # inline axes win over the ones of the table's template
+                        axes = {**templates.get(table_template, {}), **table_index}
+                        tables[active_table_key] = build_table_entry(axes, parse_table_array(payload))
+                    if metrics is not None: metrics.add("tables", time.perf_counter() - start)
+                    active_table_key, pending_base_name = None, None
+            elif keep_tables and (name == b"index_1" or name == b"index_2") and (active_table_key or pending_base_name):
+                if metrics is not None: start = time.perf_counter()
+                table_index[name.decode()] = parse_table_array(payload)
+                if metrics is not None: metrics.add("tables", time.perf_counter() - start)
+            elif name == b"mode":
+                mode_args = payload.split(b",", 1)
+                if len(mode_args) == 2:
+                    accumulator["mode"] = mode_args[1].strip().strip(b'"').decode()
+            continue
 
         # table logic (fxn to log sigma values based on argument is still  to be added)
-        sigma_match = re_sigma_type.search(raw_line)
-        if sigma_match and pending_base_name:
-            active_table_key = f"{pending_base_name}_{sigma_match.group(1).strip()}"
-        
-        if not capturing_values:
-            for t in ocv_tables + base_tables:
-                if re.search(r'\b' + t + r'\s*\(', raw_line):
-                    if t in ocv_tables: pending_base_name = t
-                    else: active_table_key = t
-                    break
-        
-        if active_table_key and "values (" in raw_line:
-            capturing_values, value_buffer = True, raw_line.split("values (", 1)[1]
-        elif capturing_values:
-            value_buffer += " " + raw_line
-        
-        if capturing_values and ");" in raw_line:
-            accumulator[active_table_key] = extract_values(value_buffer.split(");", 1)[0])
-            capturing_values, active_table_key, pending_base_name = False, None, None
+        if kind == GROUP_OPEN:
+            if name in ocv_table_names: pending_base_name = ocv_table_names[name]
+            elif name in base_table_names: active_table_key = base_table_names[name]
+            else:
+                # not a table we extract (ccs/ccsn/receiver groups...) - skip it unlexed
+                statements.send(SKIP_GROUP)
+                continue
+            bracket_depth += 1
+            table_index = {}
+            table_template = payload.strip().strip(b'"').decode() if payload else None
+            continue
+
+        bracket_depth -= 1
 
         # end of Timing Block processing
         if bracket_depth == 0:
             in_timing = False
             t_type = accumulator.get("timing_type", "N/A")
             if not any(x in t_type for x in req_types): continue
+            if lib_filter and not lib_filter.match_timing_type(t_type): continue
 
+            pin = current_pin
             rel_pin = accumulator.get("related_pin", "N/A")
             mode = accumulator.get("mode", "N/A")
             is_min = "true" in str(accumulator.get("min_delay_flag", "")).lower()
+            if cell_keys:
+                pin = f"{current_cell}/{pin}"
+                if rel_pin != "N/A": rel_pin = f"{current_cell}/{rel_pin}"
 
-            if row_buffer and (row_buffer["pin"] != current_pin or row_buffer["related_pin"] != rel_pin or row_buffer["mode"] != mode):
+            if row_buffer and (row_buffer["cell"] != current_cell or row_buffer["pin"] != pin or row_buffer["related_pin"] != rel_pin or row_buffer["mode"] != mode):
                 yield row_buffer # <--- HAND OFF DATA TO LOGGER
                 row_buffer = {}
 
             if not row_buffer:
                 row_buffer = {
-                    "pin": current_pin, "direction": current_direction, "related_pin": rel_pin, "mode": mode,
+                    "cell": current_cell, "pin": pin, "direction": current_direction, "related_pin": rel_pin, "mode": mode,
                     "setup_rise": "N/A", "setup_fall": "N/A", "hold_rise": "N/A", "hold_fall": "N/A",
                     "comb_setup_rise": "N/A", "comb_setup_fall": "N/A", "comb_hold_rise": "N/A", "comb_hold_fall": "N/A",
                     "seq_clk_arc": "N/A", "seq_setup_rise": "N/A", "seq_setup_fall": "N/A", "seq_hold_rise": "N/A", "seq_hold_fall": "N/A"
                 }
+                if ocv:
+                    row_buffer.update(dict.fromkeys(OCV_COLUMNS, "N/A"))
+                if keep_tables:
+                    row_buffer["tables"] = {}
 
-            # conditional writes to buffer based on timing_type
+            # conditional writes to buffer based on timing_type: (row_buffer column, accumulator table) pairs
             if "combinational" in t_type:
                 if is_min: 
-                    row_buffer["comb_hold_rise"], row_buffer["comb_hold_fall"] = accumulator.get("cell_rise", "N/A"), accumulator.get("cell_fall", "N/A")
+                    columns = [("comb_hold_rise", "cell_rise"), ("comb_hold_fall", "cell_fall")]
                 else: 
-                    row_buffer["comb_setup_rise"], row_buffer["comb_setup_fall"] = accumulator.get("cell_rise", "N/A"), accumulator.get("cell_fall", "N/A")
+                    columns = [("comb_setup_rise", "cell_rise"), ("comb_setup_fall", "cell_fall")]
             elif "setup" in t_type:
-                row_buffer["setup_rise"], row_buffer["setup_fall"] = accumulator.get("rise_constraint", "N/A"), accumulator.get("fall_constraint", "N/A")
+                columns = [("setup_rise", "rise_constraint"), ("setup_fall", "fall_constraint")]
             elif "hold" in t_type:
-                row_buffer["hold_rise"], row_buffer["hold_fall"] = accumulator.get("rise_constraint", "N/A"), accumulator.get("fall_constraint", "N/A")
+                columns = [("hold_rise", "rise_constraint"), ("hold_fall", "fall_constraint")]
             elif "edge" in t_type:
                 row_buffer["seq_clk_arc"] = "R" if "rising" in t_type else "F"
                 if is_min: 
-                    row_buffer["seq_hold_rise"], row_buffer["seq_hold_fall"] = accumulator.get("cell_rise", "N/A"), accumulator.get("cell_fall", "N/A")
+                    columns = [("seq_hold_rise", "cell_rise"), ("seq_hold_fall", "cell_fall")]
                 else: 
-                    row_buffer["seq_setup_rise"], row_buffer["seq_setup_fall"] = accumulator.get("cell_rise", "N/A"), accumulator.get("cell_fall", "N/A")
+                    columns = [("seq_setup_rise", "cell_rise"), ("seq_setup_fall", "cell_fall")]
+            else:
+                columns = []
+
+            for column, table_key in columns:
+                row_buffer[column] = accumulator.get(table_key, "N/A")
+                if keep_tables and table_key in tables:
+                    row_buffer["tables"][column] = tables[table_key]
+                if ocv:
+                    # e.g. setup_rise <- rise_constraint: setup_rise_sigma_early <- ocv_sigma_rise_constraint (sigma_type early)
+                    for sigma_type in ("early", "late"):
+                        ocv_key = f"ocv_sigma_{table_key}_{sigma_type}"
+                        row_buffer[f"{column}_sigma_{sigma_type}"] = accumulator.get(ocv_key, "N/A")
+                        if keep_tables and ocv_key in tables:
+                            row_buffer["tables"][f"{column}_sigma_{sigma_type}"] = tables[ocv_key]
     
     if row_buffer:
         yield row_buffer
-        
-    proc.terminate()
+
+#csv log header - one column per row_buffer field written by flush_buffer
+CSV_HEADER = [
+    "pin", "direction", "related_pin", "mode", "setup_rise", "setup_fall", "hold_rise", "hold_fall", 
+    "comb_setup_rise", "comb_setup_fall", "comb_hold_rise", "comb_hold_fall",
+    "seq_clk_arc", "seq_setup_rise", "seq_setup_fall", "seq_hold_rise", "seq_hold_fall"
+]
+
+#ocv sigma columns (parse_lib with ocv): <column>_sigma_early/_late for every timing value column
+OCV_COLUMNS = [
+    f"{column}_sigma_{sigma_type}"
+    for column in CSV_HEADER[4:] if column != "seq_clk_arc"
+    for sigma_type in ("early", "late")
+]
+
+#fxn to build the json db arc entry for one row_buffer yielded by parse_lib
+def create_arc_entry(pin_data_buffer, keep_tables=False, ocv=False):
+    arc_entry = {
+        "related_pin": pin_data_buffer.get("related_pin"),
+        "direction": pin_data_buffer.get("direction"),
+        "mode": pin_data_buffer.get("mode"),
+        "setup_rise": pin_data_buffer.get("setup_rise"),
+        "setup_fall": pin_data_buffer.get("setup_fall"),
+        "hold_rise": pin_data_buffer.get("hold_rise"),
+        "hold_fall": pin_data_buffer.get("hold_fall"),
+        "comb_setup_rise": pin_data_buffer.get("comb_setup_rise"),
+        "comb_setup_fall": pin_data_buffer.get("comb_setup_fall"),
+        "comb_hold_rise": pin_data_buffer.get("comb_hold_rise"),
+        "comb_hold_fall": pin_data_buffer.get("comb_hold_fall"),
+        "seq_clk_arc": pin_data_buffer.get("seq_clk_arc"),
+        "seq_setup_rise": pin_data_buffer.get("seq_setup_rise"),
+        "seq_setup_fall": pin_data_buffer.get("seq_setup_fall"),
+        "seq_hold_rise": pin_data_buffer.get("seq_hold_rise"),
+        "seq_hold_fall": pin_data_buffer.get("seq_hold_fall")
+    }
+    if ocv:
+        for column in OCV_COLUMNS:
+            arc_entry[column] = pin_data_buffer.get(column, "N/A")
+    if keep_tables:
+        arc_entry["tables"] = pin_data_buffer.get("tables", {})
+    return arc_entry
 
 #fxn that creates blocks to be written to json db
-def create_json_db_block(input_file):
+def create_json_db_block(input_file, keep_tables=False, ocv=False, pipelined=False):
     database = {}
     
-    for pin_data_buffer in parse_lib(input_file):
+    for pin_data_buffer in parse_lib(input_file, keep_tables, ocv=ocv, pipelined=pipelined):
         pin_name = pin_data_buffer.get("pin")
         if not pin_name:
             continue
 
-        # create the arc data object
-        arc_entry = {
-            "related_pin": pin_data_buffer.get("related_pin"),
-            "direction": pin_data_buffer.get("direction"),
-            "mode": pin_data_buffer.get("mode"),
-            "setup_rise": pin_data_buffer.get("setup_rise"),
-            "setup_fall": pin_data_buffer.get("setup_fall"),
-            "hold_rise": pin_data_buffer.get("hold_rise"),
-            "hold_fall": pin_data_buffer.get("hold_fall"),
-            "comb_setup_rise": pin_data_buffer.get("comb_setup_rise"),
-            "comb_setup_fall": pin_data_buffer.get("comb_setup_fall"),
-            "comb_hold_rise": pin_data_buffer.get("comb_hold_rise"),
-            "comb_hold_fall": pin_data_buffer.get("comb_hold_fall"),
-            "seq_clk_arc": pin_data_buffer.get("seq_clk_arc"),
-            "seq_setup_rise": pin_data_buffer.get("seq_setup_rise"),
-            "seq_setup_fall": pin_data_buffer.get("seq_setup_fall"),
-            "seq_hold_rise": pin_data_buffer.get("seq_hold_rise"),
-            "seq_hold_fall": pin_data_buffer.get("seq_hold_fall")
-        }
-
         # if this is the first time pin encounteres, create a list (of dictionaries)
         if pin_name not in database:
             database[pin_name] = []
-        database[pin_name].append(arc_entry)
+        database[pin_name].append(create_arc_entry(pin_data_buffer, keep_tables, ocv))
 
     return database
 def json_db_logger(database_content, output_json_path):
@@ -229,10 +806,37 @@ def json_db_logger(database_content, output_json_path):
 
     print(f"Successfully logged database to: {output_json_path}")
 
-    
-def flush_buffer(writer, buffer):
+#json db hash tree sidecar suffix (<db>.json.hash): arc hashes -> pin hashes -> one lib hash, read by db-process.py --diff
+HASH_SIDECAR_SUFFIX = ".hash"
+
+#fxn to hash one node of the db hash tree (8-byte blake2b, hex)
+def node_hash(text):
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+#fxn to hash one json db arc entry: its compact json text, in stored key order (db-process.py computes the same)
+def arc_hash(arc_entry):
+    return node_hash(json.dumps(arc_entry, separators=(',', ':')))
+
+#fxn to build the hash tree of a db from its arc hashes (pin -> list in stored arc order)
+#a pin hashes its arc hashes, the lib hashes (pin, pin hash) over the sorted pins, so pin order does not matter
+def build_hash_tree(arc_hashes):
+    pins = {pin: [node_hash("".join(hashes)), hashes] for pin, hashes in arc_hashes.items()}
+    lib = node_hash("".join(f"{pin}\0{pins[pin][0]}\n" for pin in sorted(pins)))
+    return {"lib": lib, "pins": pins}
+
+#fxn to write the hash tree sidecar of a finished json db, stamped with the db's size/mtime so stale sidecars are detected
+def write_hash_sidecar(db_path, arc_hashes):
+    st = os.stat(db_path)
+    tree = build_hash_tree(arc_hashes)
+    tmp_path = db_path + HASH_SIDECAR_SUFFIX + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({"size": st.st_size, "mtime": st.st_mtime, **tree}, f, separators=(',', ':'))
+    os.replace(tmp_path, db_path + HASH_SIDECAR_SUFFIX)
+
+def flush_buffer(writer, buffer, extra_columns=()):
     # writes the accumulated data for a specific pin/related_pin/mode to the CSV.
     # writer here is the object created by csv.writer() method in csv_logger() fxn
+    # extra_columns (e.g. OCV_COLUMNS) are appended after the fixed ones
     if not buffer:
         return
     writer.writerow([
@@ -240,68 +844,962 @@ def flush_buffer(writer, buffer):
         buffer["setup_rise"], buffer["setup_fall"], buffer["hold_rise"], buffer["hold_fall"],
         buffer["comb_setup_rise"], buffer["comb_setup_fall"], buffer["comb_hold_rise"], buffer["comb_hold_fall"],
         buffer["seq_clk_arc"], buffer["seq_setup_rise"], buffer["seq_setup_fall"], buffer["seq_hold_rise"], buffer["seq_hold_fall"]
-    ])
+    ] + [buffer.get(column, "N/A") for column in extra_columns])
+
+class OutputSink:
+    """
+    Base class for an output format fed by parse_lib.
+    A sink is opened once per lib file, receives every row_buffer yielded
+    by the parser through write(), and is closed when the file is done
+    (or aborted if parsing fails, so no partial output is left behind).
+    New formats subclass this and register in SINK_TYPES - they never
+    trigger another decompression/parse of the lib.
+    """
+    # output root directory and file suffix for this format, or one output_file shared by all libs
+    output_dir = None
+    suffix = None
+    output_file = None
+
+    def __init__(self, output_path, keep_tables=False, lib_name=None, source_path=None, ocv=False):
+        self.output_path = output_path
+        self.keep_tables = keep_tables
+        self.ocv = ocv
+        self.lib_name = lib_name
+        self.source_path = source_path
+
+    def open(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.output_path)), exist_ok=True)
+
+    def write(self, row_buffer):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def abort(self):
+        pass
+
+class CsvSink(OutputSink):
+    """Logs every parsed row to a csv file (one line per pin/related_pin/mode)."""
+    output_dir = CSV_DIR
+    suffix = ".csv"
+
+    def open(self):
+        super().open()
+        self.f_csv = open(self.output_path, 'w', newline='')
+        self.writer = csv.writer(self.f_csv)
+        self.extra_columns = OCV_COLUMNS if self.ocv else ()
+        self.writer.writerow(CSV_HEADER + list(self.extra_columns))
+
+    def write(self, row_buffer):
+        flush_buffer(self.writer, row_buffer, self.extra_columns)
+
+    def close(self):
+        self.f_csv.close()
+
+    def abort(self):
+        self.f_csv.close()
+        os.remove(self.output_path)
+
+class JsonDbSink(OutputSink):
+    """
+    Streams parsed rows into the per-pin arc lists of the json db. Rows of
+    a pin arrive together, so every arc is written out as soon as it is
+    parsed and memory stays flat however big the lib is (output goes to a
+    .tmp file that replaces the db on close). Output is identical to
+    json_db_logger. Every arc is hashed on the way, and the hash tree is
+    written next to the db (see write_hash_sidecar).
+    """
+    output_dir = DB_DIR
+    suffix = ".json"
+    # "pretty" (indent=4, as json_db_logger), "compact" (no whitespace) or "ndjson" (one {pin: arcs} object per line)
+    layout = "pretty"
+
+    def open(self):
+        super().open()
+        self.tmp_path = self.output_path + ".tmp"
+        self.f_json = open(self.tmp_path, 'w', encoding='utf-8')
+        self.pin = None
+        self.written = set()
+        # arcs of pins that show up again after they were written (same pin name in another cell); merged on close
+        self.late = {}
+        # pin -> arc hashes, late arcs included (they are merged at the end of their pin, in the same order)
+        self.arc_hashes = {}
+
+    def write(self, row_buffer):
+        pin_name = row_buffer.get("pin")
+        if not pin_name:
+            return
+        arc_entry = create_arc_entry(row_buffer, self.keep_tables, self.ocv)
+        self.arc_hashes.setdefault(pin_name, []).append(arc_hash(arc_entry))
+        if pin_name != self.pin:
+            if pin_name in self.written:
+                self.late.setdefault(pin_name, []).append(arc_entry)
+                return
+            self.end_pin(self.f_json)
+            self.begin_pin(self.f_json, pin_name, first=not self.written)
+            self.pin = pin_name
+            self.written.add(pin_name)
+            self.write_arc(self.f_json, arc_entry, first=True)
+        else:
+            self.write_arc(self.f_json, arc_entry, first=False)
+
+    # the pieces below write the same bytes json.dump (with this layout's separators/indent) would for the whole db
+
+    def begin_pin(self, f, pin_name, first):
+        if self.layout == "ndjson":
+            f.write("{" + json.dumps(pin_name) + ":[")
+        elif self.layout == "compact":
+            f.write(("{" if first else ",") + json.dumps(pin_name) + ":[")
+        else:
+            f.write(("{\n    " if first else ",\n    ") + json.dumps(pin_name) + ": [\n")
+
+    def write_arc(self, f, arc_entry, first):
+        if self.layout == "pretty":
+            f.write(("        " if first else ",\n        ") + json.dumps(arc_entry, indent=4).replace("\n", "\n        "))
+        else:
+            f.write(("" if first else ",") + json.dumps(arc_entry, separators=(',', ':')))
+
+    def end_pin(self, f):
+        if self.pin is None:
+            return
+        if self.layout == "ndjson":
+            f.write("]}\n")
+        else:
+            f.write("\n    ]" if self.layout == "pretty" else "]")
+        self.pin = None
+
+    def end_db(self, f, empty):
+        if self.layout == "ndjson":
+            return
+        if empty:
+            f.write("{}")
+        else:
+            f.write("\n}" if self.layout == "pretty" else "}")
+
+    #fxn to fold the late arcs into their pins - needs the whole db in memory, but only for libs that reuse pin names
+    def merge_late_pins(self):
+        database = load_json_db(self.tmp_path)
+        for pin_name, arcs in self.late.items():
+            database[pin_name].extend(arcs)
+        with open(self.tmp_path, 'w', encoding='utf-8') as f:
+            for idx, (pin_name, arcs) in enumerate(database.items()):
+                self.begin_pin(f, pin_name, first=(idx == 0))
+                self.pin = pin_name
+                for arc_idx, arc_entry in enumerate(arcs):
+                    self.write_arc(f, arc_entry, first=(arc_idx == 0))
+                self.end_pin(f)
+            self.end_db(f, not database)
+
+    def close(self):
+        self.end_pin(self.f_json)
+        self.end_db(self.f_json, not self.written)
+        self.f_json.close()
+        if self.late:
+            self.merge_late_pins()
+        os.replace(self.tmp_path, self.output_path)
+        write_hash_sidecar(self.output_path, self.arc_hashes)
+        print(f"Successfully logged database to: {self.output_path}")
+
+    def abort(self):
+        self.f_json.close()
+        os.remove(self.tmp_path)
+
+class CompactJsonDbSink(JsonDbSink):
+    """Json db without indentation/whitespace - same content, a fraction of the size."""
+    layout = "compact"
+
+class NdjsonDbSink(JsonDbSink):
+    """Json db as newline-delimited json: one {pin: [arcs]} object per line, so it can be read line by line."""
+    suffix = ".ndjson"
+    layout = "ndjson"
+
+#fxn to read a json db written in any of the JsonDbSink layouts back into a dict
+def load_json_db(json_path):
+    with open(json_path, 'r', encoding='utf-8') as f:
+        if not json_path.endswith((".ndjson", ".ndjson.tmp")):
+            return json.load(f)
+        database = {}
+        for line in f:
+            if line.strip():
+                for pin_name, arcs in json.loads(line).items():
+                    database.setdefault(pin_name, []).extend(arcs)
+        return database
+
+#numeric arc columns - stored as REAL in the sqlite db (NULL for N/A)
+NUMERIC_ARC_COLUMNS = [
+    "setup_rise", "setup_fall", "hold_rise", "hold_fall",
+    "comb_setup_rise", "comb_setup_fall", "comb_hold_rise", "comb_hold_fall",
+    "seq_setup_rise", "seq_setup_fall", "seq_hold_rise", "seq_hold_fall"
+]
+
+SQLITE_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS libs (
+    lib_id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    source_path TEXT
+);
+CREATE TABLE IF NOT EXISTS pins (
+    pin_id INTEGER PRIMARY KEY,
+    lib_id INTEGER NOT NULL REFERENCES libs(lib_id),
+    name TEXT NOT NULL,
+    direction TEXT,
+    UNIQUE (lib_id, name)
+);
+CREATE TABLE IF NOT EXISTS arcs (
+    arc_id INTEGER PRIMARY KEY,
+    lib_id INTEGER NOT NULL REFERENCES libs(lib_id),
+    pin_id INTEGER NOT NULL REFERENCES pins(pin_id),
+    arc_index INTEGER NOT NULL,
+    pin TEXT NOT NULL,
+    related_pin TEXT,
+    direction TEXT,
+    mode TEXT,
+    seq_clk_arc TEXT,
+    {", ".join(f"{c} REAL" for c in NUMERIC_ARC_COLUMNS)},
+    tables TEXT
+);
+CREATE INDEX IF NOT EXISTS arcs_pin_arc ON arcs (pin, related_pin, mode);
+CREATE INDEX IF NOT EXISTS arcs_lib_pin ON arcs (lib_id, pin, arc_index);
+"""
+
+#fxn to convert an extracted value to a sqlite REAL (None for N/A or non-numeric values)
+def to_real(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+class SqliteSink(OutputSink):
+    """
+    Writes every lib into one shared sqlite file (libs / pins / arcs tables).
+    Rows are buffered per lib and written in a single transaction on close,
+    replacing any earlier extraction of the same lib; the busy timeout lets
+    --jobs workers take turns on the file.
+    """
+    output_file = SQLITE_DB_PATH
+
+    def open(self):
+        self.rows = []
+
+    def write(self, row_buffer):
+        if row_buffer.get("pin"):
+            self.rows.append(row_buffer)
+
+    def close(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.output_path)), exist_ok=True)
+        conn = sqlite3.connect(self.output_path, timeout=600)
+        try:
+            conn.executescript(SQLITE_SCHEMA)
+            ocv_columns = OCV_COLUMNS if self.ocv else []
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                if ocv_columns:
+                    # ocv sigma columns are added on first use, so dbs created without --ocv keep working;
+                    # checked under the write lock so --jobs workers never add the same column twice
+                    existing = {row[1] for row in conn.execute("PRAGMA table_info(arcs)")}
+                    for column in ocv_columns:
+                        if column not in existing:
+                            conn.execute(f"ALTER TABLE arcs ADD COLUMN {column} REAL")
+                old = conn.execute("SELECT lib_id FROM libs WHERE name = ?", (self.lib_name,)).fetchone()
+                if old:
+                    for table in ("arcs", "pins", "libs"):
+                        conn.execute(f"DELETE FROM {table} WHERE lib_id = ?", old)
+                lib_id = conn.execute("INSERT INTO libs (name, source_path) VALUES (?, ?)", (self.lib_name, self.source_path)).lastrowid
+
+                pin_ids = {}
+                arc_rows = []
+                for row in self.rows:
+                    pin = row["pin"]
+                    if pin not in pin_ids:
+                        pin_ids[pin] = [conn.execute(
+                            "INSERT INTO pins (lib_id, name, direction) VALUES (?, ?, ?)", (lib_id, pin, row["direction"])
+                        ).lastrowid, 0]
+                    pin_id, arc_index = pin_ids[pin]
+                    pin_ids[pin][1] += 1
+                    tables = json.dumps(row["tables"]) if self.keep_tables and row.get("tables") else None
+                    arc_rows.append(
+                        [lib_id, pin_id, arc_index, pin, row["related_pin"], row["direction"], row["mode"], row["seq_clk_arc"]]
+                        + [to_real(row[c]) for c in NUMERIC_ARC_COLUMNS] + [tables]
+                        + [to_real(row.get(c)) for c in ocv_columns]
+                    )
+                columns = ["lib_id", "pin_id", "arc_index", "pin", "related_pin", "direction", "mode", "seq_clk_arc"] + NUMERIC_ARC_COLUMNS + ["tables"] + ocv_columns
+                conn.executemany(
+                    f"INSERT INTO arcs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})", arc_rows
+                )
+        finally:
+            conn.close()
+        print(f"Successfully logged {self.lib_name} to sqlite db: {self.output_path}")
+
+    def abort(self):
+        self.rows = []
+
+#registry of output formats selectable per run (cli flag name -> sink class)
+SINK_TYPES = {
+    "csv": CsvSink,
+    "db": JsonDbSink,
+    "db_compact": CompactJsonDbSink,
+    "ndjson": NdjsonDbSink,
+    "sqlite": SqliteSink,
+}
+
+class ExtractionMetrics:
+    """
+    Per-file profile of one extraction (--metrics): seconds per stage, bytes
+    in/decompressed/out, arcs emitted and the process' peak memory.
+    Stages: decompress (reading the compressed stream), lex (statement
+    regex), tables (values/index tokenizing), write (sinks) and parse (the
+    rest of the parse_lib state machine). In the pipelined mode decompress
+    and write run on their own threads and overlap with the rest; wait is
+    the time the parse stage spent blocked on them.
+    """
+    STAGES = ("decompress", "lex", "parse", "tables", "write")
+
+    def __init__(self, input_file):
+        self.input_file = input_file
+        self.stages = dict.fromkeys(self.STAGES, 0.0)
+        self.bytes_in = os.path.getsize(input_file)
+        self.bytes_decompressed = 0
+        self.bytes_out = 0
+        self.arcs = 0
+        self.seconds = 0.0
+        self.wait = 0.0
+
+    def add(self, stage, seconds):
+        self.stages[stage] += seconds
+
+    def as_record(self):
+        record = {"file": self.input_file, "status": "ok", "error": "", "seconds": round(self.seconds, 6)}
+        for stage in self.STAGES:
+            record[f"{stage}_s"] = round(self.stages[stage], 6)
+        record.update({
+            "wait_s": round(self.wait, 6),
+            "bytes_in": self.bytes_in,
+            "bytes_decompressed": self.bytes_decompressed,
+            "bytes_out": self.bytes_out,
+            "arcs": self.arcs,
+            "mb_per_s": round(self.bytes_decompressed / 1e6 / self.seconds, 3) if self.seconds else 0,
+            # ru_maxrss is in KB on linux; it is the high-water mark of the (worker) process so far, not of this file alone
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        })
+        return record
+
+class SinkWriter:
+    """
+    Write stage of the pipelined mode: rows from the parse stage are batched
+    into a bounded queue and handed to the sinks on their own thread, so
+    output encoding and file writes overlap with parsing.
+    """
+    def __init__(self, sinks, metrics=None, depth=PIPELINE_QUEUE_DEPTH, batch_rows=PIPELINE_BATCH_ROWS):
+        self.sinks = sinks
+        self.metrics = metrics
+        self.batch_rows = batch_rows
+        self.batch = []
+        self.queue = queue.Queue(maxsize=depth)
+        self.error = None
+        self.aborted = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            batch = self.queue.get()
+            if batch is None:
+                return
+            # after a failure (or abort) batches are still drained, so the parse stage never blocks on a full queue
+            if self.error or self.aborted:
+                continue
+            start = time.perf_counter()
+            try:
+                for row_buffer in batch:
+                    for sink in self.sinks:
+                        sink.write(row_buffer)
+            except Exception as e:
+                self.error = e
+            if self.metrics is not None:
+                self.metrics.add("write", time.perf_counter() - start)
+
+    def write(self, row_buffer):
+        self.batch.append(row_buffer)
+        if len(self.batch) >= self.batch_rows:
+            self._flush()
+
+    def _flush(self):
+        if self.error:
+            raise self.error
+        start = time.perf_counter()
+        self.queue.put(self.batch)
+        if self.metrics is not None:
+            self.metrics.wait += time.perf_counter() - start
+        self.batch = []
+
+    #fxn to hand over the last batch and wait until the sinks have written everything
+    def close(self):
+        if self.batch:
+            self._flush()
+        self.queue.put(None)
+        self.thread.join()
+        if self.error:
+            raise self.error
+
+    def abort(self):
+        self.aborted = True
+        self.queue.put(None)
+        self.thread.join()
+
+#fxn to abort sinks after a failure; a failing abort is reported and does not keep the other sinks from cleaning up
+def abort_sinks(sinks):
+    for sink in sinks:
+        try:
+            sink.abort()
+        except Exception as e:
+            print(f"Warning: could not clean up partial output '{sink.output_path}': {e}")
+
+#fxn to close every sink: a sink whose close fails is aborted, the others are still closed, then the first error is raised
+def close_sinks(sinks):
+    error = None
+    for sink in sinks:
+        try:
+            sink.close()
+        except Exception as e:
+            abort_sinks([sink])
+            error = error or e
+    if error:
+        raise error
+
+#fxn to fan one parse_lib pass over a lib file out to every given sink
+#with metrics, sink write time and emitted arcs are recorded and the remaining loop time is booked as parse
+#with pipelined, decompression and sink writes run as separate stages on their own threads (bounded queues in between)
+#lib_filter/cell_keys/ocv are handed to parse_lib
+def run_sinks(input_file, sinks, keep_tables=False, metrics=None, lib_filter=None, cell_keys=False, ocv=False, pipelined=False):
+    opened = []
+    try:
+        for sink in sinks:
+            sink.open()
+            opened.append(sink)
+        if pipelined:
+            writer = SinkWriter(sinks, metrics)
+            loop_start = time.perf_counter()
+            try:
+                for pin_data_buffer in parse_lib(input_file, keep_tables, metrics, lib_filter, cell_keys, ocv, pipelined=True):
+                    writer.write(pin_data_buffer)
+                    if metrics is not None:
+                        metrics.arcs += 1
+            except BaseException:
+                writer.abort()
+                raise
+            if metrics is not None:
+                # decompress/write ran on their own threads: what is left of this thread's loop is parse
+                loop_end = time.perf_counter()
+                metrics.add("parse", loop_end - loop_start - metrics.stages["lex"] - metrics.stages["tables"] - metrics.wait)
+            writer.close()
+            if metrics is not None:
+                metrics.wait += time.perf_counter() - loop_end
+        elif metrics is None:
+            for pin_data_buffer in parse_lib(input_file, keep_tables, None, lib_filter, cell_keys, ocv):
+                for sink in sinks:
+                    sink.write(pin_data_buffer)
+        else:
+            loop_start = time.perf_counter()
+            for pin_data_buffer in parse_lib(input_file, keep_tables, metrics, lib_filter, cell_keys, ocv):
+                start = time.perf_counter()
+                for sink in sinks:
+                    sink.write(pin_data_buffer)
+                metrics.add("write", time.perf_counter() - start)
+                metrics.arcs += 1
+            loop_seconds = time.perf_counter() - loop_start
+            metrics.add("parse", loop_seconds - sum(metrics.stages.values()))
+    except BaseException:
+        # only sinks that got opened have anything to clean up
+        abort_sinks(opened)
+        raise
+    if metrics is not None: start = time.perf_counter()
+    close_sinks(sinks)
+    if metrics is not None: metrics.add("write", time.perf_counter() - start)
 
 #fxn to log data to csv
-def csv_logger(input_file, output_csv):
-    os.makedirs(os.path.dirname(os.path.abspath(output_csv)), exist_ok=True)
-    with open(output_csv, 'w', newline='') as f_csv:
-        writer = csv.writer(f_csv)
-        
-        # Write the Header
-        writer.writerow([
-            "pin", "direction", "related_pin", "mode", "setup_rise", "setup_fall", "hold_rise", "hold_fall", 
-            "comb_setup_rise", "comb_setup_fall", "comb_hold_rise", "comb_hold_fall",
-            "seq_clk_arc", "seq_setup_rise", "seq_setup_fall", "seq_hold_rise", "seq_hold_fall"
-        ])
-
-        # iterate through the generator
-        # this calls parse_lib and waits for it to 'yield' data & pin_data_buffer is the variable that holds row_buffer once it yields
-        for pin_data_buffer in parse_lib(input_file):
-            flush_buffer(writer, pin_data_buffer)
+def csv_logger(input_file, output_csv, pipelined=False):
+    run_sinks(input_file, [CsvSink(output_csv)], pipelined=pipelined)
+
+#fxn to get the output path a sink writes for a given lib filename
+def sink_output_path(sink_name, filename):
+    sink_cls = SINK_TYPES[sink_name]
+    if sink_cls.output_file:
+        return sink_cls.output_file
+    return os.path.join(sink_cls.output_dir, lib_stem(filename) + sink_cls.suffix)
+
+#fxn that runs the requested extraction(s) for a single lib file; kept at module level so pool workers can pickle it
+#sink_names are keys of SINK_TYPES - all of them are written from a single parse of the file
+#returns the file's metrics record (see ExtractionMetrics) with collect_metrics, else None
+#with profile_dir, the extraction runs under cProfile and the stats are dumped to <profile_dir>/<lib>.prof
+#lib_filter (a LibFilter) and cell_keys select/qualify what parse_lib extracts; ocv adds the sigma early/late columns
+def process_lib_file(full_input_path, sink_names, keep_tables=False, collect_metrics=False, profile_dir=None, lib_filter=None, cell_keys=False, ocv=False, pipelined=False):
+    filename = os.path.basename(full_input_path)
+
+    sinks = [
+        SINK_TYPES[name](sink_output_path(name, filename), keep_tables, lib_stem(filename), full_input_path, ocv)
+        for name in sink_names
+    ]
+    metrics = ExtractionMetrics(full_input_path) if collect_metrics else None
+
+    start = time.perf_counter()
+    if profile_dir:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.runcall(run_sinks, full_input_path, sinks, keep_tables, metrics, lib_filter, cell_keys, ocv, pipelined)
+        os.makedirs(profile_dir, exist_ok=True)
+        profiler.dump_stats(os.path.join(profile_dir, lib_stem(filename) + ".prof"))
+    else:
+        run_sinks(full_input_path, sinks, keep_tables, metrics, lib_filter, cell_keys, ocv, pipelined)
+
+    if metrics is None:
+        return None
+    metrics.seconds = time.perf_counter() - start
+    # per-lib outputs only - a shared output file (sqlite) holds every lib
+    metrics.bytes_out = sum(os.path.getsize(sink.output_path) for sink in sinks if not sink.output_file and os.path.exists(sink.output_path))
+    return metrics.as_record()
+
+#fxn to load the extraction manifest (lib path -> fingerprint + outputs of its last successful extraction)
+def load_manifest(manifest_path):
+    if not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Warning: ignoring unreadable manifest '{manifest_path}': {e}")
+        return {}
+
+#fxn to persist the manifest; written to a temp file and renamed so an interrupted run never leaves it half written
+def save_manifest(manifest, manifest_path):
+    os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+#fxn to hash the raw (compressed) contents of a lib file
+def lib_content_hash(input_file):
+    digest = hashlib.sha256()
+    with open(input_file, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+#fxn to decide whether a lib needs (re-)extraction; returns its fingerprint, or None when it can be skipped
+#a lib is skipped when its manifest entry covers the requested outputs, those outputs exist,
+#and its size/mtime (or, with use_hash, its content hash) are unchanged
+#scope describes a partial/cell-keyed extraction (None for a full one); outputs of a different scope never count
+def check_stale_file(path, manifest, sink_names, keep_tables, use_hash=False, force=False, scope=None, ocv=False):
+    st = os.stat(path)
+    fingerprint = {"size": st.st_size, "mtime": st.st_mtime}
+    entry = manifest.get(path)
+    outputs_ok = (
+        entry is not None
+        and set(sink_names) <= set(entry.get("outputs", {}))
+        and (not keep_tables or entry.get("tables", False))
+        and (not ocv or entry.get("ocv", False))
+        and entry.get("scope") == scope
+        and all(os.path.exists(entry["outputs"][name]) for name in sink_names)
+    )
+    if not force and outputs_ok and entry["size"] == fingerprint["size"] and entry["mtime"] == fingerprint["mtime"]:
+        return None
+    if use_hash:
+        fingerprint["hash"] = lib_content_hash(path)
+        # touched but byte-identical lib: refresh its stat info, keep the outputs
+        if not force and outputs_ok and entry.get("hash") == fingerprint["hash"]:
+            entry.update(fingerprint)
+            return None
+    return fingerprint
+
+#fxn to record a successful extraction in the manifest
+#outputs from earlier runs of the same (unchanged) lib are kept, so e.g. a --db run does not forget an earlier --csv log
+def record_manifest_entry(manifest, path, fingerprint, sink_names, keep_tables, scope=None, ocv=False):
+    filename = os.path.basename(path)
+    previous = manifest.get(path, {})
+    same_lib = (previous.get("size") == fingerprint["size"] and previous.get("mtime") == fingerprint["mtime"]
+                and previous.get("scope") == scope)
+
+    entry = dict(fingerprint)
+    entry["outputs"] = dict(previous.get("outputs", {})) if same_lib else {}
+    entry["outputs"].update({name: sink_output_path(name, filename) for name in sink_names})
+    # full tables only live in the json/sqlite dbs, so the flag follows whichever run last wrote one of them
+    writes_tables = any(name in ("db", "db_compact", "ndjson", "sqlite") for name in sink_names)
+    entry["tables"] = keep_tables if writes_tables else (same_lib and previous.get("tables", False))
+    if scope is not None:
+        entry["scope"] = scope
+    # every output of an --ocv run has the sigma columns; outputs kept from an earlier run only if that run had them too
+    kept_outputs = set(entry["outputs"]) - set(sink_names)
+    if ocv and (not kept_outputs or previous.get("ocv", False)):
+        entry["ocv"] = True
+    manifest[path] = entry
+
+#fxn to dispatch extraction over the file list - serially, or over a process pool when jobs > 1
+#f_list may also be a generator (e.g. fed by the crawler), files are then extracted as they arrive
+#on_success(path) is called in this process as each file completes (used to checkpoint the manifest)
+#returns a list of (filepath, error) for files that failed, so one bad lib does not abort the whole run
+#with metrics (a list), one ExtractionMetrics record per file - failed ones included - is appended to it
+def run_extraction(f_list, sink_names, jobs=1, keep_tables=False, on_success=None, metrics=None, profile_dir=None, lib_filter=None, cell_keys=False, ocv=False, pipelined=False):
+    total_files = len(f_list) if hasattr(f_list, "__len__") else "?"
+    failures = []
+    collect_metrics = metrics is not None
+
+    if jobs <= 1:
+        for idx, full_input_path in enumerate(f_list, 1):
+            filename = os.path.basename(full_input_path)
+            print(f" Progress: [{idx}/{total_files}] analyzing {filename}...", end="\r")
+            try:
+                record = process_lib_file(full_input_path, sink_names, keep_tables, collect_metrics, profile_dir, lib_filter, cell_keys, ocv, pipelined)
+            except Exception as e:
+                failures.append((full_input_path, e))
+                if collect_metrics:
+                    metrics.append({"file": full_input_path, "status": "failed", "error": str(e)})
+                continue
+            if collect_metrics:
+                metrics.append(record)
+            if on_success:
+                on_success(full_input_path)
+        return failures
+
+    finished = 0
+
+    def collect(future, full_input_path):
+        nonlocal finished
+        finished += 1
+        filename = os.path.basename(full_input_path)
+        try:
+            record = future.result()
+            print(f" Progress: [{finished}/{total_files}] finished {filename}...", end="\r")
+        except Exception as e:
+            failures.append((full_input_path, e))
+            if collect_metrics:
+                metrics.append({"file": full_input_path, "status": "failed", "error": str(e)})
+            print(f" Progress: [{finished}/{total_files}] FAILED {filename}...", end="\r")
+            return
+        if collect_metrics:
+            metrics.append(record)
+        if on_success:
+            on_success(full_input_path)
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {}
+        done = queue.Queue()
+        # progress is reported in order of completion, not submission; files finished while
+        # later ones are still being submitted (streamed in) are collected along the way
+        for path in f_list:
+            future = pool.submit(process_lib_file, path, sink_names, keep_tables, collect_metrics, profile_dir, lib_filter, cell_keys, ocv, pipelined)
+            futures[future] = path
+            future.add_done_callback(done.put)
+            while not done.empty():
+                future = done.get()
+                collect(future, futures.pop(future))
+        while futures:
+            future = done.get()
+            collect(future, futures.pop(future))
+    return failures
+
+#metrics file columns, one row per lib (see ExtractionMetrics.as_record)
+METRICS_FIELDS = (["file", "status", "error", "seconds"] + [f"{stage}_s" for stage in ExtractionMetrics.STAGES]
+                  + ["wait_s", "bytes_in", "bytes_decompressed", "bytes_out", "arcs", "mb_per_s", "peak_rss_mb"])
+
+#fxn to write the per-file metrics of a run: .json gets run totals + per-file records, anything else a csv (one row per lib)
+def write_metrics(records, metrics_path, wall_seconds, jobs):
+    ok = [r for r in records if r["status"] == "ok"]
+    totals = {"files": len(records), "failed": len(records) - len(ok), "wall_seconds": round(wall_seconds, 3), "jobs": jobs}
+    for field in METRICS_FIELDS[3:-2]:
+        totals[field] = round(sum(r[field] for r in ok), 6)
+
+    os.makedirs(os.path.dirname(os.path.abspath(metrics_path)), exist_ok=True)
+    if metrics_path.endswith(".json"):
+        with open(metrics_path, 'w') as f:
+            json.dump({"totals": totals, "files": records}, f, indent=4)
+    else:
+        with open(metrics_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=METRICS_FIELDS, restval="")
+            writer.writeheader()
+            writer.writerows(records)
+
+    # short summary: where the time went overall, and the slowest libs
+    stage_total = sum(totals[f"{stage}_s"] for stage in ExtractionMetrics.STAGES) or 1
+    print(f"Metrics written to: {metrics_path}")
+    print("  " + " | ".join(f"{stage} {100 * totals[f'{stage}_s'] / stage_total:.0f}%" for stage in ExtractionMetrics.STAGES))
+    for r in sorted(ok, key=lambda r: r["seconds"], reverse=True)[:5]:
+        print(f"  {r['seconds']:8.3f}s {r['mb_per_s']:8.1f} MB/s {r['arcs']:8} arcs  {os.path.basename(r['file'])}")
+
+#library-level attributes kept as corner metadata in the consolidated store (besides the operating_conditions groups)
+LIB_HEADER_ATTRIBUTES = {b"nom_process", b"nom_voltage", b"nom_temperature", b"default_operating_conditions", b"time_unit", b"voltage_unit"}
+
+#fxn to read the PVT header of a lib: LIB_HEADER_ATTRIBUTES plus every operating_conditions group (name -> attributes)
+#lexing stops at the first cell group, so only the head of the file is decompressed
+def read_lib_header(input_file):
+    header = {}
+    operating_conditions = {}
+    condition = None
+    depth = 0
+    statements = iter_lib_statements(input_file)
+    for kind, name, payload in statements:
+        if kind == GROUP_OPEN:
+            if depth == 1 and name == b"cell":
+                break
+            if depth == 1 and name == b"operating_conditions":
+                condition = payload.strip().strip(b'"').decode()
+                operating_conditions[condition] = {}
+            elif depth >= 1 and condition is None:
+                # templates, units... nothing to keep inside
+                statements.send(SKIP_GROUP)
+                continue
+            depth += 1
+        elif kind == GROUP_CLOSE:
+            depth -= 1
+            if depth == 1:
+                condition = None
+        elif kind == SIMPLE_ATTR:
+            value = payload.decode()
+            try:
+                value = float(value)
+            except ValueError:
+                pass
+            if depth == 1 and name in LIB_HEADER_ATTRIBUTES:
+                header[name.decode()] = value
+            elif condition is not None and depth == 2:
+                operating_conditions[condition][name.decode()] = value
+    statements.close()
+    if operating_conditions:
+        header["operating_conditions"] = operating_conditions
+    return header
+
+#arc fields describing an arc's structure - every other field of a json db arc is a per-corner number
+CONSOLIDATED_STRING_FIELDS = ["related_pin", "direction", "mode", "seq_clk_arc"]
+#structure file of a consolidated store (corners, pins, arcs); each numeric attribute is <attribute>.npy next to it
+CONSOLIDATED_STRUCTURE = "structure.json"
+
+#fxn to turn a json db value into a float (NaN for N/A or anything non-numeric)
+def to_float(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return float("nan")
+
+#fxn to merge the per-corner json dbs of db_dir into one consolidated store at store_path:
+#  structure.json - corners (name, db file, source lib, PVT header), pins -> [start, end) arc rows, per-arc string fields
+#  <attribute>.npy - float64 (arc x corner) matrix, NaN where the value is N/A or the corner lacks the arc
+#  present.npy - bool (arc x corner) matrix, which corners have the arc
+#arcs are keyed (pin, related_pin, mode, n) like db-process.py's stats; arcs of a pin are consecutive rows, so a pin's values
+#over all corners are one slice. the PVT header is read from the source lib recorded in the manifest (if it still exists)
+#lookup tables (--tables) are not carried over - interpolation keeps using the per-corner dbs
+def consolidate_db_dir(db_dir, store_path, manifest=None):
+    db_files, stems = [], set()
+    for filename in sorted(os.listdir(db_dir)) if os.path.isdir(db_dir) else []:
+        if not filename.endswith((".json", ".ndjson")):
+            continue
+        stem = filename.rsplit(".", 1)[0]
+        if stem in stems:
+            print(f"Warning: {filename} skipped, corner '{stem}' already has a json db")
+            continue
+        stems.add(stem)
+        db_files.append(filename)
+    if not db_files:
+        print(f"Nothing to consolidate: no json dbs in {db_dir}")
+        return
+
+    # json db -> source lib, from the manifest outputs
+    sources = {}
+    for lib_path, entry in (manifest or {}).items():
+        for output in entry.get("outputs", {}).values():
+            sources[os.path.abspath(output)] = lib_path
+
+    corners = []
+    fields = []           # every arc field seen, in first-seen order (arc dicts are rebuilt in this order)
+    attributes = []       # the numeric ones
+    known_fields = set()
+    non_numeric = set(CONSOLIDATED_STRING_FIELDS) | {"tables"}
+    arc_rows = {}         # (pin, related_pin, mode, n) -> row, rows in first-seen order
+    arc_strings = []      # row -> string fields as first seen
+    pin_rows = {}         # pin -> its rows
+    overrides = {}        # row -> {corner: {field: value}} where a corner's string field differs from the first one
+    corner_values = []    # per corner: (rows of its arcs, {attribute: (arc positions, values)})
+    for corner, filename in enumerate(db_files):
+        db_path = os.path.join(db_dir, filename)
+        database = load_json_db(db_path)
+        source = sources.get(os.path.abspath(db_path))
+        pvt = read_lib_header(source) if source and os.path.exists(source) else {}
+        corners.append({"name": filename.rsplit(".", 1)[0], "db_file": filename, "source": source, "pvt": pvt})
+
+        rows = []
+        columns = {}
+        for pin, arcs in database.items():
+            seen = Counter()
+            for arc in arcs:
+                base_key = (pin, arc.get("related_pin", "N/A"), arc.get("mode", "N/A"))
+                key = base_key + (seen[base_key],)
+                seen[base_key] += 1
+                strings = [arc.get(field, "N/A") for field in CONSOLIDATED_STRING_FIELDS]
+                row = arc_rows.get(key)
+                if row is None:
+                    row = arc_rows[key] = len(arc_strings)
+                    arc_strings.append(strings)
+                    pin_rows.setdefault(pin, []).append(row)
+                elif strings != arc_strings[row]:
+                    overrides.setdefault(row, {})[corner] = {f: v for f, v, first in zip(CONSOLIDATED_STRING_FIELDS, strings, arc_strings[row]) if v != first}
+                position = len(rows)
+                rows.append(row)
+                for field, value in arc.items():
+                    if field not in known_fields:
+                        known_fields.add(field)
+                        if field != "tables":
+                            fields.append(field)
+                            if field not in CONSOLIDATED_STRING_FIELDS:
+                                attributes.append(field)
+                    if field in non_numeric:
+                        continue
+                    positions, values = columns.setdefault(field, ([], []))
+                    positions.append(position)
+                    values.append(to_float(value))
+        corner_values.append((np.array(rows, dtype=np.int64), columns))
+        del database
+
+    # renumber rows so every pin's arcs are consecutive
+    order = [row for rows in pin_rows.values() for row in rows]
+    new_row = np.empty(len(order), dtype=np.int64)
+    new_row[order] = np.arange(len(order))
+    pins, start = [], 0
+    for pin, rows in pin_rows.items():
+        pins.append([pin, start, start + len(rows)])
+        start += len(rows)
+
+    tmp_path = store_path + ".tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    present = np.zeros((len(order), len(corners)), dtype=bool)
+    for corner, (rows, _) in enumerate(corner_values):
+        present[new_row[rows], corner] = True
+    np.save(os.path.join(tmp_path, "present.npy"), present)
+    for attribute in attributes:
+        matrix = np.full((len(order), len(corners)), np.nan)
+        for corner, (rows, columns) in enumerate(corner_values):
+            if attribute in columns:
+                positions, values = columns[attribute]
+                matrix[new_row[rows[positions]], corner] = values
+        np.save(os.path.join(tmp_path, attribute + ".npy"), matrix)
+
+    structure = {
+        "version": 1,
+        "corners": corners,
+        "fields": fields,
+        "string_fields": CONSOLIDATED_STRING_FIELDS,
+        "attributes": attributes,
+        "pins": pins,
+        "arcs": [arc_strings[row] for row in order],
+        "overrides": {int(new_row[row]): per_corner for row, per_corner in overrides.items()},
+    }
+    with open(os.path.join(tmp_path, CONSOLIDATED_STRUCTURE), 'w') as f:
+        json.dump(structure, f, separators=(",", ":"))
+    # swap the new store in (the old one is removed first - directories cannot be replaced in one rename)
+    shutil.rmtree(store_path, ignore_errors=True)
+    os.replace(tmp_path, store_path)
+
+    json_mb = sum(os.path.getsize(os.path.join(db_dir, f)) for f in db_files) / 1e6
+    store_mb = sum(os.path.getsize(os.path.join(store_path, f)) for f in os.listdir(store_path)) / 1e6
+    print(f"Consolidated {len(corners)} corner(s), {len(pins)} pins, {len(order)} arcs, {len(attributes)} attributes into: {store_path}")
+    print(f"  {json_mb:.2f} MB of json dbs -> {store_mb:.2f} MB")
 
 def main():
     parser = argparse.ArgumentParser(description="Automated Extraction Dispatcher")
     parser.add_argument("filepath", help="File containing list of directory paths to scan")
     parser.add_argument("--csv",action = "store_true",help="Logs extracted data for a lib file in csv format")
     parser.add_argument("--db",action = "store_true", help="Logs data into a db in json format")
+    parser.add_argument("--db_compact", action="store_true", help="Like --db, but the json db is written without indentation (much smaller file)")
+    parser.add_argument("--ndjson", action="store_true", help="Logs data into a newline-delimited json db (<lib>.ndjson, one pin per line)")
+    parser.add_argument("--sqlite", action="store_true", help=f"Logs data into a single indexed sqlite db ({SQLITE_DB_PATH})")
+    parser.add_argument("--tables", action="store_true", help="Also store full lookup tables (index_1/index_2 axes + values) for every arc in the json db")
+    parser.add_argument("--jobs", type=int, default=1, help="Number of worker processes used to extract lib files in parallel (default: 1)")
+    parser.add_argument("--force", action="store_true", help="Re-extract every lib, even those the manifest marks as unchanged")
+    parser.add_argument("--hash", action="store_true", help="Also compare content hashes, so libs that were only touched (new mtime, same bytes) are skipped")
+    parser.add_argument("--manifest", default=MANIFEST_PATH, help=f"Extraction manifest path (default: {MANIFEST_PATH})")
+    parser.add_argument("--include", nargs="+", help="Only pick up lib files matching these shell-style globs (name or path relative to the listed directory)")
+    parser.add_argument("--exclude", nargs="+", help="Skip lib files and directories (not descended into) matching these shell-style globs")
+    parser.add_argument("--max_depth", type=int, help="Only crawl this many directory levels below each listed directory (0: its own files only)")
+    parser.add_argument("--scan_jobs", type=int, default=8, help="Number of directories listed concurrently by the crawler (default: 8)")
+    parser.add_argument("--crawl_cache", default=CRAWL_CACHE_PATH, help=f"Directory listing cache; directories with an unchanged mtime are not re-listed (default: {CRAWL_CACHE_PATH})")
+    parser.add_argument("--rescan", action="store_true", help="Ignore the crawl cache and list every directory again (the cache is rewritten)")
+    parser.add_argument("--cells", nargs="+", help="Only extract these cells (shell-style globs); other cell groups are skipped unparsed")
+    parser.add_argument("--pins", nargs="+", help="Only extract these pins (shell-style globs), in every cell; with plain --cells and --pins names, parsing stops once all were read")
+    parser.add_argument("--timing_types", nargs="+", help="Only extract arcs of these timing types (shell-style globs, e.g. setup_* hold_*)")
+    parser.add_argument("--ocv", action="store_true", help="Also extract the ocv sigma early/late value (and table, with --tables) of every timing column, e.g. setup_rise_sigma_late")
+    parser.add_argument("--cell_keys", action="store_true", help="Key pins (and related pins) as <cell>/<pin>, so same-named pins of different cells do not collide")
+    parser.add_argument("--consolidate", nargs="?", const=CONSOLIDATED_DB_PATH, metavar="STORE", help=f"After extraction, merge every corner's json db into one consolidated store (default: {CONSOLIDATED_DB_PATH}) with per-arc value vectors and corner PVT metadata")
+    parser.add_argument("--pipeline", action="store_true", help="Run decompression, parsing and output writing of each lib as overlapped stages on separate threads (bounded queues in between)")
+    parser.add_argument("--metrics", help="Record per-file/per-stage timings, bytes in/out, arcs and peak memory into this file (.json, otherwise csv)")
+    parser.add_argument("--profile", help="Run each lib's extraction under cProfile and dump the stats to <this dir>/<lib>.prof")
     args = parser.parse_args()
 
     #fxn call that returns directory_list after reading a given directory-list file
     dir_list = read_directory_list_file(args.filepath)
-    
-    #fxn call that returns file list within all the directories in dir_list, given they match a specific condn
-    f_list = create_file_list(dir_list)
 
-    total_files = len(f_list)
-    if total_files == 0:
-        print("No .lib.gz files found.")
-        return
+    # every selected output is written from the same single parse of each lib; csv is the default
+    sink_names = [name for name in SINK_TYPES if getattr(args, name)] or ["csv"]
+    if args.db and args.db_compact:
+        sys.exit("Error: --db and --db_compact write the same <lib>.json file, pick one.")
 
-    print(f"Found {total_files} files. Starting analysis...")
-    
-    for idx, full_input_path in enumerate(f_list, 1):
-        filename = os.path.basename(full_input_path)
+    # cell/pin/timing_type selection pushed down into the parser; partial outputs are tracked as their own scope in the manifest
+    lib_filter = LibFilter(args.cells, args.pins, args.timing_types)
+    scope = lib_filter.describe() or {}
+    if args.cell_keys:
+        scope["cell_keys"] = True
+    scope = scope or None
 
-        csv_log_name = filename.replace(".lib.gz", ".csv")
-        json_db_name = filename.replace(".lib.gz", ".json")
+    # lib files are crawled on a background thread and handed to extraction as they are found
+    crawler = DirectoryCrawler(args.include, args.exclude, args.max_depth, args.scan_jobs, args.crawl_cache, args.rescan)
+    manifest = load_manifest(args.manifest)
+    fingerprints = {}
+    counts = {"found": 0, "skipped": 0}
 
-        output_csv_path = os.path.join(CSV_DIR, csv_log_name)
-        output_json_path = os.path.join(DB_DIR, json_db_name)
+    # skip libs already extracted with unchanged contents - also resumes an interrupted run
+    def stale_files():
+        for path in crawler.crawl(dir_list):
+            counts["found"] += 1
+            fingerprint = check_stale_file(path, manifest, sink_names, args.tables, args.hash, args.force, scope, args.ocv)
+            if fingerprint is None:
+                counts["skipped"] += 1
+                continue
+            fingerprints[path] = fingerprint
+            yield path
 
-        print(f" Progress: [{idx}/{total_files}] analyzing {filename}...", end="\r")
+    print(f"Scanning {len(dir_list)} director(ies) with {max(args.scan_jobs, 1)} thread(s), extracting with {max(args.jobs, 1)} worker(s)...")
 
-        if args.csv:
-            csv_logger(full_input_path, output_csv_path)
+    #checkpoint the manifest after every finished lib so a killed run picks up where it stopped
+    def on_success(path):
+        record_manifest_entry(manifest, path, fingerprints[path], sink_names, args.tables, scope, args.ocv)
+        save_manifest(manifest, args.manifest)
 
-        elif args.db:
-            db_block = create_json_db_block(full_input_path)
-            json_db_logger(db_block, output_json_path)
-        else:
-            csv_logger(full_input_path, output_csv_path)
+    metrics = [] if args.metrics else None
+    start = time.perf_counter()
+    failures = run_extraction(stale_files(), sink_names, args.jobs, args.tables, on_success, metrics, args.profile, lib_filter or None, args.cell_keys, args.ocv, args.pipeline)
+
+    print(f"\nCrawl: {crawler.listed} director(ies) listed, {crawler.cached} unchanged (cached).")
+    if counts["found"] == 0:
+        print("No lib files (.lib.gz/.lib.bz2/.lib.xz/.lib) found.")
+        return
+    if counts["skipped"]:
+        print(f"Found {counts['found']} files, {counts['skipped']} unchanged since last run (use --force to re-extract).")
+        save_manifest(manifest, args.manifest)
+    if counts["found"] == counts["skipped"]:
+        print("Nothing to do.")
+    else:
+        print("Completed extraction of all files.")
+
+    if metrics:
+        write_metrics(metrics, args.metrics, time.perf_counter() - start, max(args.jobs, 1))
 
+    # the merge runs over the whole db folder, so it also picks up corners extracted by earlier runs
+    if args.consolidate:
+        consolidate_db_dir(DB_DIR, args.consolidate, manifest)
 
-    print("\nCompleted extraction of all files.")
+    if failures:
+        print(f"[!] {len(failures)} file(s) failed during extraction:")
+        for path, err in failures:
+            print(f"    {path}: {err}")
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
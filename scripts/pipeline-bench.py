@@ -0,0 +1,216 @@
+import argparse
+import bz2
+import contextlib
+import filecmp
+import gzip
+import importlib.util
+import inspect
+import io
+import lzma
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+#load the hyphenated scripts as modules (a plain import does not work for them)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def load_script(module_name, path):
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    # registered so functions of the script can be pickled over to pool workers (forked, so they see it too)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+synth_lib_gen = load_script("synth_lib_gen", os.path.join(SCRIPT_DIR, "synth-lib-gen.py"))
+
+#lib suffixes and their openers - kept here (not taken from the gen script) so older gen scripts can be benchmarked too
+LIB_OPENERS = {".lib.gz": gzip.open, ".lib.bz2": bz2.open, ".lib.xz": lzma.open, ".lib": open}
+
+#fxn to get the lib name without its (compressed) lib suffix
+def lib_stem(filename):
+    for suffix in LIB_OPENERS:
+        if filename.endswith(suffix):
+            return filename[:-len(suffix)]
+    return filename
+
+#fxn to get the decompressed size of a lib file in bytes
+def decompressed_size(lib_path):
+    opener = next(opener for suffix, opener in LIB_OPENERS.items() if lib_path.endswith(suffix))
+    with opener(lib_path, "rb") as stream:
+        return sum(len(chunk) for chunk in iter(lambda: stream.read(4 * 1024 * 1024), b""))
+
+#fxn to time fn() a few times; returns (best elapsed seconds, result of the last call)
+#stdout is swallowed so the scripts' progress prints do not end up in the report
+def best_of(fn, repeat):
+    best, result = None, None
+    for _ in range(max(repeat, 1)):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+#fxn to print one report row
+def report(stage, seconds, mb, arcs):
+    mb_s = mb / seconds if seconds else 0
+    arcs_s = arcs / seconds if seconds else 0
+    print(f"{stage:<24}{seconds:>10.3f}{mb:>10.2f}{mb_s:>10.1f}{arcs:>10}{arcs_s:>12.0f}")
+
+#fxn to write the csv log and json db of every lib with the given gen script - the outputs the golden check compares
+#written through the same single-parse sinks the cli uses (--csv --db); gen scripts from before the sinks use the old loggers
+def write_outputs(gen, lib_paths, out_dir):
+    csv_dir = os.path.join(out_dir, "csv-logs")
+    db_dir = os.path.join(out_dir, "db-dir")
+    os.makedirs(db_dir, exist_ok=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for lib_path in lib_paths:
+            stem = lib_stem(os.path.basename(lib_path))
+            csv_path, db_path = os.path.join(csv_dir, stem + ".csv"), os.path.join(db_dir, stem + ".json")
+            if hasattr(gen, "run_sinks") and hasattr(gen, "JsonDbSink"):
+                gen.run_sinks(lib_path, [gen.CsvSink(csv_path, lib_name=stem, source_path=lib_path),
+                                         gen.JsonDbSink(db_path, lib_name=stem, source_path=lib_path)])
+            else:
+                gen.csv_logger(lib_path, csv_path)
+                gen.json_db_logger(gen.create_json_db_block(lib_path), db_path)
+    return csv_dir, db_dir
+
+#sidecar files next to the json dbs (pin index, hash tree) - they carry mtimes, so they are not part of the golden outputs
+SIDECAR_SUFFIXES = (".idx", ".hash")
+
+#fxn to compare two output trees file by file; returns the list of differing/missing relative paths
+def diff_outputs(golden_dir, out_dir):
+    problems = []
+    for root, _, files in os.walk(golden_dir):
+        for f in files:
+            if f.endswith(SIDECAR_SUFFIXES):
+                continue
+            rel = os.path.relpath(os.path.join(root, f), golden_dir)
+            candidate = os.path.join(out_dir, rel)
+            if not os.path.exists(candidate):
+                problems.append(f"missing: {rel}")
+            elif not filecmp.cmp(os.path.join(root, f), candidate, shallow=False):
+                problems.append(f"differs: {rel}")
+    for root, _, files in os.walk(out_dir):
+        for f in files:
+            if f.endswith(SIDECAR_SUFFIXES):
+                continue
+            rel = os.path.relpath(os.path.join(root, f), out_dir)
+            if not os.path.exists(os.path.join(golden_dir, rel)):
+                problems.append(f"extra: {rel}")
+    return sorted(problems)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark (and golden-check) the extraction pipeline on synthetic Liberty files")
+    parser.add_argument("--lib_dir", help="Benchmark the .lib files in this directory instead of generating synthetic ones")
+    parser.add_argument("--libs", type=int, default=3, help="Synthetic corner libs to generate (default: 3)")
+    parser.add_argument("--pins", type=int, default=256, help="Synthetic input/output pin pairs per lib (default: 256)")
+    parser.add_argument("--arcs_per_pin", type=int, default=4, help="Synthetic timing groups per pin (default: 4)")
+    parser.add_argument("--table_size", type=synth_lib_gen.parse_table_size, default=(7, 7), help="Synthetic table size as <index_1>x<index_2> (default: 7x7)")
+    parser.add_argument("--ocv", action="store_true", help="Add ocv sigma early/late tables to the synthetic libs")
+    parser.add_argument("--modes", type=int, default=2, help="Mode groups on synthetic combinational arcs (default: 2)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic libs (default: 0)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage; best run is reported (default: 3)")
+    parser.add_argument("--gen_script", default=os.path.join(SCRIPT_DIR, "ip-db-gen-script.py"), help="ip-db-gen-script.py to benchmark (e.g. an older copy extracted with git show)")
+    parser.add_argument("--process_script", default=os.path.join(SCRIPT_DIR, "db-process.py"), help="db-process.py to benchmark")
+    parser.add_argument("--pipelined", action="store_true", help="Also time the gen script's pipelined mode (--pipeline) and check its outputs match the serial ones")
+    parser.add_argument("--load_jobs", type=int, default=0, help="Also time parallel full loads (load_database over this many worker processes), with whole arcs and with the structure-only arcs --compare --all asks for")
+    parser.add_argument("--golden", help="Directory of golden csv/json outputs: check the gen script's outputs against it (exit 1 on any difference)")
+    parser.add_argument("--update_golden", action="store_true", help="With --golden: (re)write the golden outputs from the gen script instead of checking")
+    args = parser.parse_args()
+
+    gen = load_script("ip_db_gen", args.gen_script)
+    proc = load_script("db_process", args.process_script)
+
+    work_dir = tempfile.mkdtemp(prefix="pipeline-bench-")
+    try:
+        if args.lib_dir:
+            lib_paths = sorted(os.path.join(args.lib_dir, f) for f in os.listdir(args.lib_dir) if f.endswith(tuple(LIB_OPENERS)))
+        else:
+            config = synth_lib_gen.SynthLibConfig(args.pins, args.arcs_per_pin, args.table_size[0], args.table_size[1], args.ocv, args.modes)
+            lib_paths = synth_lib_gen.generate_libs(os.path.join(work_dir, "libs"), args.libs, config, args.seed)
+        if not lib_paths:
+            sys.exit("Error: no lib files to benchmark.")
+
+        lib_mb = sum(decompressed_size(p) for p in lib_paths) / 1e6
+        print(f"{len(lib_paths)} lib(s), {lib_mb:.2f} MB decompressed | gen script: {args.gen_script}")
+        print(f"{'stage':<24}{'seconds':>10}{'MB':>10}{'MB/s':>10}{'arcs':>10}{'arcs/s':>12}")
+
+        seconds, arcs = best_of(lambda: sum(sum(1 for _ in gen.parse_lib(p)) for p in lib_paths), args.repeat)
+        report("parse_lib", seconds, lib_mb, arcs)
+
+        seconds, _ = best_of(lambda: [gen.create_json_db_block(p) for p in lib_paths], args.repeat)
+        report("create_json_db_block", seconds, lib_mb, arcs)
+
+        csv_dir = os.path.join(work_dir, "csv")
+        seconds, _ = best_of(lambda: [gen.csv_logger(p, os.path.join(csv_dir, lib_stem(os.path.basename(p)) + ".csv")) for p in lib_paths], args.repeat)
+        report("csv_logger", seconds, lib_mb, arcs)
+
+        if args.pipelined:
+            seconds, _ = best_of(lambda: [gen.create_json_db_block(p, pipelined=True) for p in lib_paths], args.repeat)
+            report("  --pipeline json block", seconds, lib_mb, arcs)
+            pipelined_csv_dir = os.path.join(work_dir, "csv-pipelined")
+            seconds, _ = best_of(lambda: [gen.csv_logger(p, os.path.join(pipelined_csv_dir, lib_stem(os.path.basename(p)) + ".csv"), pipelined=True) for p in lib_paths], args.repeat)
+            report("  --pipeline csv_logger", seconds, lib_mb, arcs)
+            problems = diff_outputs(csv_dir, pipelined_csv_dir)
+            if problems:
+                print(f"PIPELINED OUTPUTS DIFFER FROM SERIAL ({len(problems)} file(s)):")
+                for problem in problems:
+                    print(f"  {problem}")
+                sys.exit(1)
+
+        # db-side stages run on json dbs written by the benchmarked gen script
+        out_dir = os.path.join(work_dir, "out")
+        _, db_dir = write_outputs(gen, lib_paths, out_dir)
+        db_mb = sum(os.path.getsize(os.path.join(db_dir, f)) for f in os.listdir(db_dir)) / 1e6
+
+        seconds, all_dbs = best_of(lambda: proc.load_database(db_dir), args.repeat)
+        db_arcs = sum(len(arcs) for db in all_dbs for arcs in db.values())
+        report("load_database", seconds, db_mb, db_arcs)
+
+        load_params = inspect.signature(proc.load_database).parameters
+        if args.load_jobs > 1 and "jobs" in load_params:
+            seconds, _ = best_of(lambda: proc.load_database(db_dir, jobs=args.load_jobs), args.repeat)
+            report(f"  {args.load_jobs} load jobs", seconds, db_mb, db_arcs)
+        if args.load_jobs > 1 and "fields" in load_params:
+            fields = ("related_pin", "mode")
+            seconds, arc_dbs = best_of(lambda: proc.load_database(db_dir, jobs=args.load_jobs, fields=fields), args.repeat)
+            report(f"  {args.load_jobs} jobs, arc fields", seconds, db_mb, db_arcs)
+            if proc.db_compare_all(arc_dbs) != proc.db_compare_all(all_dbs):
+                sys.exit("Error: --compare --all differs on the field-projected load.")
+
+        # older db-process.py copies only have the recursive db_compare_arc (and no bulk compare engine)
+        compare_chain = getattr(proc, "compare_arc_chains", None) or getattr(proc, "db_compare_arc")
+        def compare_all_chains():
+            visited = set()
+            for pin in all_dbs[0]:
+                compare_chain(all_dbs, pin, visited)
+        seconds, _ = best_of(compare_all_chains, args.repeat)
+        report(compare_chain.__name__, seconds, db_mb, db_arcs)
+
+        # (the very first db_compare_all was the cli's own --all loop, without a databases argument)
+        if hasattr(proc, "db_compare_all") and "databases" in inspect.signature(proc.db_compare_all).parameters:
+            seconds, _ = best_of(lambda: proc.db_compare_all(all_dbs), args.repeat)
+            report("db_compare_all", seconds, db_mb, db_arcs)
+
+        if args.golden:
+            if args.update_golden:
+                shutil.rmtree(args.golden, ignore_errors=True)
+                shutil.copytree(out_dir, args.golden)
+                print(f"Golden outputs written to: {args.golden}")
+            else:
+                problems = diff_outputs(args.golden, out_dir)
+                if problems:
+                    print(f"GOLDEN CHECK FAILED ({len(problems)} file(s)):")
+                    for problem in problems:
+                        print(f"  {problem}")
+                    sys.exit(1)
+                print(f"Golden check passed: outputs match {args.golden}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+#fxn to time repeated cold runs of one db-process.py command line; returns a list of wall times in seconds
+def time_command(script, db_path, cmd_args, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, script, db_path] + cmd_args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return times
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup/latency benchmark for db-process.py subcommands")
+    parser.add_argument("folderpath", help="Database directory (or .sqlite db) passed to db-process.py")
+    parser.add_argument("--pin", required=True, help="Pin used for the lookup/compare commands")
+    parser.add_argument("--attribute", default="setup_rise", help="Attribute used for the lookup command (default: setup_rise)")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per command (default: 10)")
+    parser.add_argument("--baseline", help="Path to an older db-process.py to compare against (e.g. extracted with git show)")
+    parser.add_argument("--server", help="Socket of a running db-process.py --serve; also time the commands through it")
+    args = parser.parse_args()
+
+    commands = [
+        ("get_attribute", ["--pins", args.pin, "--get_attribute", args.attribute]),
+        ("compare", ["--compare", "--pins", args.pin]),
+    ]
+    scripts = [("current", os.path.join(SCRIPT_DIR, "db-process.py"))]
+    if args.baseline:
+        scripts.insert(0, ("baseline", args.baseline))
+
+    # bare interpreter startup, to show how much of each run is the script itself
+    start_times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"])
+        start_times.append(time.perf_counter() - start)
+    print(f"python interpreter alone: min {min(start_times) * 1000:.1f} ms")
+
+    print(f"{'script':<10}{'command':<16}{'min ms':>10}{'mean ms':>10}")
+    for script_name, script in scripts:
+        for cmd_name, cmd_args in commands:
+            times = time_command(script, args.folderpath, cmd_args, args.repeat)
+            print(f"{script_name:<10}{cmd_name:<16}{min(times) * 1000:>10.1f}{sum(times) / len(times) * 1000:>10.1f}")
+    if args.server:
+        script = os.path.join(SCRIPT_DIR, "db-process.py")
+        for cmd_name, cmd_args in commands:
+            times = time_command(script, args.folderpath, cmd_args + ["--server", args.server], args.repeat)
+            print(f"{'server':<10}{cmd_name:<16}{min(times) * 1000:>10.1f}{sum(times) / len(times) * 1000:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import argparse
+import gzip
+import io
+import os
+import random
+
+#timing groups cycled through for input pins (constraint arcs to a clock) - timing_type, tables
+INPUT_TIMING_TYPES = [
+    ("setup_rising", ["rise_constraint", "fall_constraint"]),
+    ("hold_rising", ["rise_constraint", "fall_constraint"]),
+    ("setup_falling", ["rise_constraint", "fall_constraint"]),
+    ("hold_falling", ["rise_constraint", "fall_constraint"]),
+]
+#ocv sigma table emitted next to each base table when --ocv is given
+OCV_TABLES = {
+    "rise_constraint": "ocv_sigma_rise_constraint",
+    "fall_constraint": "ocv_sigma_fall_constraint",
+    "cell_rise": "ocv_sigma_cell_rise",
+    "cell_fall": "ocv_sigma_cell_fall",
+}
+
+class SynthLibConfig:
+    """Shape of the generated libs: pin/arc counts, table size and optional groups."""
+    def __init__(self, pins=64, arcs_per_pin=4, index_1=7, index_2=7, ocv=False, modes=2, power=False, clocks=1):
+        self.pins = pins
+        self.arcs_per_pin = arcs_per_pin
+        self.index_1 = index_1
+        self.index_2 = index_2
+        self.ocv = ocv
+        self.modes = modes
+        self.power = power
+        self.clocks = clocks
+
+#fxn to format one lookup table group (index_1/index_2/values) the way characterisation tools write them
+def format_table(name, config, rng, base, sigma_type=None, indent="        "):
+    index_1 = ", ".join(f"{0.005 * 2 ** i:.6f}" for i in range(config.index_1))
+    index_2 = ", ".join(f"{0.001 * 2 ** i:.6f}" for i in range(config.index_2))
+    rows = []
+    for r in range(config.index_1):
+        rows.append('"' + ", ".join(f"{base + 0.01 * r + 0.002 * c + rng.uniform(0, 0.001):.6f}" for c in range(config.index_2)) + '"')
+    lines = [f"{indent}{name} (delay_template_{config.index_1}x{config.index_2}) {{"]
+    if sigma_type:
+        lines.append(f"{indent}  sigma_type : {sigma_type};")
+    lines.append(f'{indent}  index_1 ("{index_1}");')
+    lines.append(f'{indent}  index_2 ("{index_2}");')
+    lines.append(f"{indent}  values ( \\")
+    lines.append(f"{indent}    " + (", \\\n" + indent + "    ").join(rows) + " \\")
+    lines.append(f"{indent}  );")
+    lines.append(f"{indent}}}")
+    return "\n".join(lines) + "\n"
+
+#fxn to format one timing() group with its base tables (and ocv early/late sigma tables)
+def format_timing(related_pin, timing_type, tables, config, rng, base, mode=None, min_delay=False):
+    s = "      timing () {\n"
+    s += f'        related_pin : "{related_pin}";\n'
+    s += f"        timing_type : {timing_type};\n"
+    if min_delay:
+        s += "        min_delay_flag : true;\n"
+    if mode:
+        s += f'        mode (func_mode, "{mode}");\n'
+    for i, table in enumerate(tables):
+        s += format_table(table, config, rng, base + 0.05 * i)
+        if config.ocv:
+            s += format_table(OCV_TABLES[table], config, rng, 0.1 * base, sigma_type="early")
+            s += format_table(OCV_TABLES[table], config, rng, 0.1 * base, sigma_type="late")
+    s += "      }\n"
+    return s
+
+#fxn to format an internal_power group - not extracted, but real libs are full of them
+def format_power(related_pin, config, rng, base):
+    s = "      internal_power () {\n"
+    s += f'        related_pin : "{related_pin}";\n'
+    s += format_table("rise_power", config, rng, base)
+    s += format_table("fall_power", config, rng, base)
+    s += "      }\n"
+    return s
+
+#fxn to yield the text of one synthetic lib piece by piece (one pin per chunk)
+def iter_lib_text(lib_name, config, rng, offset=0.0):
+    clocks = [f"CLK{c}" if c else "CLK" for c in range(max(config.clocks, 1))]
+    yield (f"library ({lib_name}) {{\n"
+           "  delay_model : table_lookup;\n"
+           "  nom_process : 1;\n  nom_voltage : 0.75;\n  nom_temperature : 25;\n"
+           f"  cell (synth_ip) {{\n    area : {rng.uniform(100, 1000):.3f};\n")
+    for clock in clocks:
+        yield f"    pin ({clock}) {{\n      direction : input;\n      clock : true;\n      capacitance : 0.002;\n    }}\n"
+
+    for p in range(config.pins):
+        base = offset + 0.01 * (p % 97)
+        s = f"    pin (D{p}) {{\n      direction : input;\n      capacitance : {rng.uniform(0.001, 0.004):.6f};\n"
+        for a in range(config.arcs_per_pin):
+            timing_type, tables = INPUT_TIMING_TYPES[a % len(INPUT_TIMING_TYPES)]
+            s += format_timing(clocks[(a // len(INPUT_TIMING_TYPES)) % len(clocks)], timing_type, tables, config, rng, base + 0.1 * a)
+        s += "    }\n"
+        yield s
+
+        # the matching output: clock-to-q arcs (max/min) plus mode-dependent combinational arcs from the input
+        s = f'    pin ("Q{p}") {{\n      direction : output;\n      max_capacitance : 0.2;\n'
+        for a in range(config.arcs_per_pin):
+            kind = a % 3
+            if kind < 2:
+                s += format_timing(clocks[0], "rising_edge", ["cell_rise", "cell_fall"], config, rng, base + 0.2 * a, min_delay=(kind == 1))
+            else:
+                mode = f"m{a % config.modes}" if config.modes else None
+                s += format_timing(f"D{p}", "combinational", ["cell_rise", "cell_fall"], config, rng, base + 0.3 * a, mode=mode)
+        if config.power:
+            s += format_power(clocks[0], config, rng, base)
+        s += "    }\n"
+        yield s
+    yield "  }\n}\n"
+
+#fxn to write one synthetic .lib.gz (mtime=0 in the gzip header, so reruns are byte-identical)
+def write_synthetic_lib(output_path, lib_name, config, seed=0, offset=0.0):
+    rng = random.Random(seed)
+    with io.TextIOWrapper(gzip.GzipFile(output_path, "wb", compresslevel=6, mtime=0)) as f:
+        for chunk in iter_lib_text(lib_name, config, rng, offset):
+            f.write(chunk)
+
+#fxn to generate a set of corners (same structure, shifted values) plus the directory list doc ip-db-gen-script.py reads
+#returns the list of generated lib paths
+def generate_libs(out_dir, n_libs, config, seed=0):
+    os.makedirs(out_dir, exist_ok=True)
+    lib_paths = []
+    for corner in range(n_libs):
+        lib_path = os.path.join(out_dir, f"synth_corner{corner}.lib.gz")
+        write_synthetic_lib(lib_path, f"synth_corner{corner}", config, seed=seed + corner, offset=0.05 * corner)
+        lib_paths.append(lib_path)
+    with open(os.path.join(out_dir, "ip-directory-list.txt"), "w") as f:
+        f.write(os.path.abspath(out_dir) + "\n")
+    return lib_paths
+
+#fxn to parse a table size given as <index_1>x<index_2> (e.g. 7x7)
+def parse_table_size(text):
+    try:
+        n1, n2 = (int(n) for n in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"table size must look like 7x7, got '{text}'")
+    return n1, n2
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Liberty (.lib.gz) files shaped like real IP libs, for benchmarking the extraction pipeline")
+    parser.add_argument("out_dir", help="Directory to write the libs (and an ip-directory-list.txt pointing at it) into")
+    parser.add_argument("--libs", type=int, default=3, help="Number of corner libs to generate (default: 3)")
+    parser.add_argument("--pins", type=int, default=64, help="Number of input/output pin pairs per lib (default: 64)")
+    parser.add_argument("--arcs_per_pin", type=int, default=4, help="Timing groups per pin (default: 4)")
+    parser.add_argument("--table_size", type=parse_table_size, default=(7, 7), help="Lookup table size as <index_1>x<index_2> (default: 7x7)")
+    parser.add_argument("--ocv", action="store_true", help="Add ocv_sigma_* early/late tables to every timing group")
+    parser.add_argument("--modes", type=int, default=2, help="Number of mode groups used by combinational arcs, 0 for none (default: 2)")
+    parser.add_argument("--clocks", type=int, default=1, help="Number of clock pins constraint arcs are spread over (default: 1)")
+    parser.add_argument("--power", action="store_true", help="Add internal_power groups (not extracted - exercises skipping)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed; the same options and seed give identical libs (default: 0)")
+    args = parser.parse_args()
+
+    config = SynthLibConfig(args.pins, args.arcs_per_pin, args.table_size[0], args.table_size[1], args.ocv, args.modes, args.power, args.clocks)
+    lib_paths = generate_libs(args.out_dir, args.libs, config, args.seed)
+    total_mb = sum(os.path.getsize(p) for p in lib_paths) / 1e6
+    print(f"Generated {len(lib_paths)} lib(s) in {args.out_dir} ({total_mb:.2f} MB compressed)")
+    print(f"Directory list doc: {os.path.join(args.out_dir, 'ip-directory-list.txt')}")
+
+if __name__ == "__main__":
+    main()